@@ -0,0 +1,42 @@
+"""
+Production entry point for the AI Council research system.
+
+Serves wsgi:app with Hypercorn in a single worker with no reloader.
+wsgi.py's own __main__ block is the development server.
+
+Research sessions in progress, the research stream subscriptions, the research
+and search caches and the research concurrency cap all live in process memory.
+Raising WEB_CONCURRENCY above 1 therefore splits them across workers: polls and
+streams that land on another worker miss updates, and the concurrency cap is
+multiplied by the worker count. Only scale out once that state is shared.
+"""
+import os
+import sys
+
+from hypercorn.config import Config
+from hypercorn.run import run
+
+# Worker processes inherit this, so wsgi.py configures INFO-level logging
+os.environ.setdefault('AI_COUNCIL_DEBUG', 'false')
+
+
+def build_config() -> Config:
+    """Hypercorn settings, overridable through the environment"""
+    config = Config()
+    config.application_path = "wsgi:app"
+    config.bind = [os.environ.get('BIND', '0.0.0.0:8000')]
+    config.workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+    config.use_reloader = False
+    # Shutdown drains background research for RESEARCH_DRAIN_TIMEOUT (2 s by default)
+    # and then marks what is left failed; both have to fit in this window
+    config.graceful_timeout = float(os.environ.get('GRACEFUL_TIMEOUT', '3'))
+    try:
+        import uvloop  # noqa: F401
+        config.worker_class = "uvloop"
+    except ImportError:
+        config.worker_class = "asyncio"
+    return config
+
+
+if __name__ == "__main__":
+    sys.exit(run(build_config()))
@@ -2,35 +2,96 @@
 Quart application for the AI Council research system.
 """
 from quart import Quart, request, jsonify, render_template, send_from_directory
-from datetime import datetime
+import asyncio
 import os
+import sys
+from datetime import date
 from typing import Dict, Any
+from quart.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
 from quart_cors import cors
+import orjson
 from config import Config as AppCustomConfig # Your custom config class from src/config.py
-import logging # Ensure logging is imported if logger is used
+import logging
 from pathlib import Path
+from functools import lru_cache
+from bson import ObjectId
 
-from src.langchain.chains.ai_council import AICouncil, AICouncilMember
-from src.langchain.chains.research_services import MongoDBService
-from src.langchain.chains.research_base import ResearchConfig
-from src.backend.blueprints.research import research_bp
+logger = logging.getLogger(__name__)
+
+_SRC_DIR = Path(__file__).parent
+_STATIC_DIR = _SRC_DIR / 'frontend' / 'static'
+_TEMPLATE_DIR = _SRC_DIR / 'frontend' / 'templates'
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, keeping the default provider's wire format.
+
+    Keys are sorted and dates are sent as HTTP dates, as Quart's own provider does;
+    ObjectIds and other unknown types serialise via str().
+    """
+
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, date):
+            return http_date(obj)
+        return str(obj)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self._default, option=self.OPTIONS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # jsonify bodies go straight from orjson bytes into the response, skipping the
+        # decode and newline re-concatenation of the default implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self._default, option=self.OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def install_event_loop_policy() -> str:
+    """Use uvloop where available; Windows gets the proactor loop, elsewhere stock asyncio"""
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        return "proactor"
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not available, using default asyncio event loop")
+        return "asyncio"
+    uvloop.install()
+    return "uvloop"
+
+@lru_cache(maxsize=None)
+def _load_research_routes():
+    """Import the research blueprint module on first use and hand back its registration hook"""
+    from src.backend.blueprints.research import register_research_routes
+    return register_research_routes
 
 # No need to set Quart.config_class as we're monkey-patching Quart's Config class directly
 # in config.py before any Quart app is instantiated
 
 def create_app():
-    print("[DEBUG app.py] create_app called.")
-    src_dir = Path(__file__).parent
+    # Deferred so importing this module doesn't pull in LangChain and the Mongo drivers
+    from src.langchain.chains.ai_council import get_council
+    from src.langchain.chains.research_services import MongoDBService
+    from src.langchain.chains.research_base import ResearchConfig, research_slots
+    from src.database.mongodb import get_async_client
+
+    logger.debug("create_app called.")
     
-    print("[DEBUG app.py] About to instantiate Quart app.")
+    logger.debug("About to instantiate Quart app.")
     app = Quart(__name__,
-                static_folder=src_dir / 'frontend' / 'static',
-                template_folder=src_dir / 'frontend' / 'templates')
-    print("[DEBUG app.py] Quart app instantiated.")
+                static_folder=_STATIC_DIR,
+                template_folder=_TEMPLATE_DIR)
+    app.json = ORJSONProvider(app)
+    logger.debug("Quart app instantiated.")
     
     # Load our custom config
     app.config.from_object(AppCustomConfig())
-    print(f"[DEBUG app.py] Custom config loaded, PROVIDE_AUTOMATIC_OPTIONS: {app.config.get('PROVIDE_AUTOMATIC_OPTIONS')}")
+    logger.debug("Custom config loaded, PROVIDE_AUTOMATIC_OPTIONS: %s", app.config.get('PROVIDE_AUTOMATIC_OPTIONS'))
     
     cors(app, 
      allow_origin="*", 
@@ -39,204 +100,244 @@ def create_app():
      expose_headers=["Content-Type", "Authorization"],
      max_age=3600,
      send_origin_wildcard=True)
-    print("[DEBUG app.py] CORS configured.")
+    logger.debug("CORS configured.")
 
     # Initialize service infrastructure
     research_config_instance = ResearchConfig.from_config()
-    db_service = MongoDBService(research_config_instance) 
-    council = AICouncil(research_config_instance)
-    council.enable_member("grok")
-    logger = logging.getLogger(__name__)
-    print("[DEBUG app.py] Services initialized.")
+    db_service = MongoDBService(
+        research_config_instance,
+        client=get_async_client(research_config_instance.mongo_connection)
+    )
+    council = get_council()
+    logger.debug("Services initialized.")
+
+    # Trees of council members that have already finished, by guide, while the rest are
+    # still running. Only the worker running the research has them; others report none yet.
+    partial_trees: Dict[str, Dict[str, Any]] = {}
+
+    _load_research_routes()(app)
+    from src.backend.blueprints.research import publish_research_event, spawn_research_task
+    logger.debug("Blueprint registered.")
+
+    # Rendered output of templates that take no per-request variables
+    rendered_pages: Dict[str, str] = {}
 
-    app.register_blueprint(research_bp, url_prefix='/api')
-    print("[DEBUG app.py] Blueprint registered.")
+    async def render_static_page(template_name: str) -> str:
+        """Render a variable-free template once and reuse the HTML, unless templates auto-reload"""
+        if app.templates_auto_reload:
+            return await render_template(template_name)
+        page = rendered_pages.get(template_name)
+        if page is None:
+            page = rendered_pages[template_name] = await render_template(template_name)
+        return page
 
     @app.route("/")
     async def index():
-        return await render_template("index.html")
+        return await render_static_page("index.html")
 
     @app.route("/research")
     async def research():
         """Serve the research page"""
-        return await render_template("research.html")
+        return await render_static_page("research.html")
 
     @app.route("/guide/<guide_id>/research")
     async def get_guide_research(guide_id: str):
         """Get research results for a guide"""
-        logger.debug(f"Attempting to get research for guide_id: {guide_id}")
+        logger.debug("Attempting to get research for guide_id: %s", guide_id)
+        if not ObjectId.is_valid(guide_id):
+            return "Invalid guide ID", 400
         
         try:
             # Check if guide exists
-            logger.debug(f"Looking up guide in guides collection: {guide_id}")
-            guide = await db_service.get_guide(guide_id)
+            logger.debug("Looking up guide in guides collection: %s", guide_id)
+            guide = await db_service.get_guide(guide_id, projection={"_id": 1})
             
             if not guide:
-                logger.error(f"Guide not found in guides collection: {guide_id}")
+                logger.error("Guide not found in guides collection: %s", guide_id)
                 return "Guide not found", 404
             
             # Render the template with guide_id
-            logger.debug(f"Rendering research.html template for guide_id: {guide_id}")
+            logger.debug("Rendering research.html template for guide_id: %s", guide_id)
             return await render_template("research.html", guide_id=guide_id)
             
         except Exception as e:
-            logger.error(f"Error getting guide research: {str(e)}", exc_info=True)
+            logger.error("Error getting guide research: %s", e, exc_info=True)
             return f"Error: {str(e)}", 500
 
+    async def run_research_task(guide_id: str, topic: str):
+        """Run council research in the background and upsert the outcome into the guide stub create_research wrote"""
+        try:
+            async with research_slots:
+                logger.debug("Starting research for guide_id: %s", guide_id)
+                publish_research_event(guide_id, {"id": guide_id, "status": "running"})
+                trees = partial_trees.setdefault(guide_id, {})
+                
+                async def store_partial(member_name: str, tree: Dict[str, Any]):
+                    trees[member_name] = tree
+                    publish_research_event(guide_id, {"id": guide_id, "status": "running", "ai": member_name, "tree": tree})
+                    
+                research_results_obj = await council.conduct_research(topic, session_id=guide_id, on_partial=store_partial)
+                logger.debug("Research completed for guide_id: %s", guide_id)
+            
+            # Store research results (upserts the guide document)
+            logger.debug("Storing research results for guide_id: %s", guide_id)
+            await db_service.store_research(research_results_obj.to_dict() if hasattr(research_results_obj, 'to_dict') else research_results_obj, guide_id)
+            logger.debug("Research results stored for guide_id: %s", guide_id)
+            publish_research_event(guide_id, {"id": guide_id, "status": "completed", "message": None})
+        except Exception as e:
+            logger.error("Research failed for guide_id %s: %s", guide_id, e, exc_info=True)
+            try:
+                await db_service.store_research({"topic": topic, "status": "failed", "status_message": str(e)}, guide_id)
+            except Exception as store_error:
+                logger.error("Failed to record research failure for guide_id %s: %s", guide_id, store_error)
+            # Published even if recording failed, so streams do not wait on a guide that will never finish
+            publish_research_event(guide_id, {"id": guide_id, "status": "failed", "message": str(e)})
+        finally:
+            partial_trees.pop(guide_id, None)
+
+    def start_background_research(guide_id: str, topic: str):
+        """Schedule research off the request path; shutdown drains it with the blueprint's research"""
+        spawn_research_task(run_research_task(guide_id, topic), "guides", guide_id, "updated_at")
+
     @app.route("/api/research", methods=["POST"])
     async def create_research():
-        """Create a new research session and start research"""
+        """Create a new research session and start research in the background"""
         logger.debug("Received request to create new research")
         data = await request.get_json()
-        logger.debug(f"Request data: {data}")
+        logger.debug("Request data: %s", data)
         
         if not data or "topic" not in data:
             logger.error("No topic provided in request")
             return jsonify({"error": "Topic is required"}), 400
             
-        # Create session in database
-        logger.debug(f"Creating research session for topic: {data['topic']}")
-        session_id = await db_service.store_research({
-            "topic": data['topic'],
-            "status": "initializing",
-            "metadata": {
-                "created": datetime.utcnow(),
-                "updated": datetime.utcnow()
-            },
-            "research": {},
-            "children": []
-        })
-        logger.debug(f"Created session with ID: {session_id}")
-        
-        # Start research
-        logger.debug(f"Starting research for session {session_id}")
-        research_results_obj = await council.conduct_research(data["topic"], session_id=session_id)
-        logger.debug(f"Research completed for session {session_id}")
+        # A placeholder guide makes the session visible to every worker straight away;
+        # the research results are upserted into it once they arrive
+        session_id = str(ObjectId())
+        try:
+            await db_service.create_guide_stub(session_id, data["topic"])
+        except Exception as e:
+            logger.error("Error creating research session: %s", e, exc_info=True)
+            return jsonify({"error": str(e)}), 500
+        logger.debug("Created session with ID: %s", session_id)
         
-        # Store research results
-        logger.debug(f"Storing research results for session {session_id}")
-        # Assuming conduct_research returns an object that can be converted to dict or is already a dict
-        await db_service.store_research(research_results_obj.to_dict() if hasattr(research_results_obj, 'to_dict') else research_results_obj, session_id)
-        logger.debug(f"Research results stored for session {session_id}")
+        start_background_research(session_id, data["topic"])
         
-        return jsonify({"guide_id": session_id})
+        return jsonify({"guide_id": session_id}), 202
 
     @app.route("/api/research/results/<guide_id>", methods=["GET"])
     async def get_research_results_api(guide_id: str): # Renamed to avoid conflict with other get_research_results
         """Get research results for a guide via API"""
+        if not ObjectId.is_valid(guide_id):
+            return jsonify({"error": "Invalid guide ID"}), 400
         try:
-            # Get guide data
-            logger.debug(f"Getting guide data for guide_id: {guide_id}")
-            guide = await db_service.get_guide(guide_id)
-            if not guide:
-                logger.error(f"Guide not found: {guide_id}")
-                return jsonify({"error": "Guide not found"}), 404
-                
-            # Get research results
-            logger.debug(f"Getting research results for guide_id: {guide_id}")
+            # The results carry the guide's topic, so one lookup serves the whole response
+            logger.debug("Getting research results for guide_id: %s", guide_id)
             results = await db_service.get_research_results(guide_id)
             if not results:
-                logger.debug(f"No research results found for guide_id: {guide_id}, returning initializing state")
+                logger.error("Guide not found: %s", guide_id)
+                return jsonify({"error": "Guide not found"}), 404
+                
+            if results.get("status") == "failed":
+                logger.debug("Research failed for guide_id: %s", guide_id)
+                return jsonify({
+                    "status": "error",
+                    "message": results.get("status_message", "Research failed"),
+                    "topic": results["topic"]
+                })
+            if results.get("status") in ("running", "initializing"):
+                logger.debug("Research still running for guide_id: %s, returning initializing state", guide_id)
                 return jsonify({
                     "status": "initializing",
-                    "topic": guide["topic"],
-                    "trees": {}
+                    "topic": results["topic"],
+                    "trees": partial_trees.get(guide_id, {})
                 })
                 
-            logger.debug(f"Returning completed research results for guide_id: {guide_id}")
+            logger.debug("Returning completed research results for guide_id: %s", guide_id)
             return jsonify({
                 "status": "completed",
-                "topic": guide["topic"],
+                "topic": results["topic"],
                 "trees": results.get("trees", {})
             })
         except Exception as e:
-            logger.error(f"Error getting research results: {str(e)}", exc_info=True)
+            logger.error("Error getting research results: %s", e, exc_info=True)
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/research/initialize/<guide_id>", methods=["POST"])
     async def initialize_research_api(guide_id: str): # Renamed for clarity
         """Initialize research for a guide via API"""
+        if not ObjectId.is_valid(guide_id):
+            return jsonify({"error": "Invalid guide ID"}), 400
         try:
-            # Get guide data
-            logger.debug(f"Getting guide data for guide_id: {guide_id}")
-            guide = await db_service.get_guide(guide_id)
+            # Claim the guide and read its topic in one atomic step, so two
+            # concurrent initialize calls cannot both start research
+            logger.debug("Claiming guide for research: %s", guide_id)
+            guide = await db_service.claim_guide_for_research(guide_id)
             if not guide:
-                logger.error(f"Guide not found: {guide_id}")
+                if await db_service.guide_exists(guide_id):
+                    logger.debug("Research already running for guide_id: %s", guide_id)
+                    return jsonify({"error": "Research already running"}), 409
+                logger.error("Guide not found: %s", guide_id)
                 return jsonify({"error": "Guide not found"}), 404
                 
-            # Start research
-            logger.debug(f"Starting research for guide_id: {guide_id}")
-            research_results_obj = await council.conduct_research(guide["topic"], session_id=guide_id)
-            logger.debug(f"Research completed for guide_id: {guide_id}")
+            # Start research in the background; clients poll the results endpoint
+            start_background_research(guide_id, guide["topic"])
             
-            # Store research results
-            logger.debug(f"Storing research results for guide_id: {guide_id}")
-            await db_service.store_research(research_results_obj.to_dict() if hasattr(research_results_obj, 'to_dict') else research_results_obj, guide_id)
-            logger.debug(f"Research results stored for guide_id: {guide_id}")
-            
-            return jsonify({"status": "success"})
+            return jsonify({"status": "accepted"}), 202
         except Exception as e:
-            logger.error(f"Error initializing research: {str(e)}", exc_info=True)
+            logger.error("Error initializing research: %s", e, exc_info=True)
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/research/<guide_id>/subtopics", methods=["POST"])
     async def research_subtopic_api(guide_id: str):
+        if not ObjectId.is_valid(guide_id):
+            return jsonify({"error": "Invalid guide ID", "status": "error"}), 400
         try:
-            logger.debug(f"[DEBUG] Subtopic API request received for guide_id: {guide_id}")
+            logger.debug("Subtopic API request received for guide_id: %s", guide_id)
             data = await request.get_json()
-            logger.debug(f"[DEBUG] Request data: {data}")
+            logger.debug("Request data: %s", data)
             
             if not data or "topic" not in data:
-                logger.error(f"[DEBUG] Missing required field 'topic' in request data: {data}")
+                logger.error("Missing required field 'topic' in request data: %s", data)
                 return jsonify({"error": "Topic is required", "status": "error"}), 400
                 
             if "ai" not in data:
-                logger.error(f"[DEBUG] Missing required field 'ai' in request data: {data}")
+                logger.error("Missing required field 'ai' in request data: %s", data)
                 return jsonify({"error": "AI identifier is required", "status": "error"}), 400
                 
             if "parent_node_id" not in data:
-                logger.error(f"[DEBUG] Missing required field 'parent_node_id' in request data: {data}")
+                logger.error("Missing required field 'parent_node_id' in request data: %s", data)
                 return jsonify({"error": "Parent node ID is required", "status": "error"}), 400
             
-            logger.debug(f"[DEBUG] All required fields present: topic={data['topic']}, ai={data['ai']}, parent_node_id={data['parent_node_id']}")
+            logger.debug("All required fields present: topic=%s, ai=%s, parent_node_id=%s", data['topic'], data['ai'], data['parent_node_id'])
                 
-            guide = await db_service.get_guide(guide_id)
+            guide = await db_service.get_guide(guide_id, projection={"topic": 1})
             if not guide:
-                logger.error(f"[DEBUG] Guide not found: {guide_id}")
+                logger.error("Guide not found: %s", guide_id)
                 return jsonify({"error": "Guide not found", "status": "error"}), 404
                 
-            logger.debug(f"[DEBUG] Found guide: {guide_id}, topic: {guide.get('topic', 'unknown')}")
+            logger.debug("Found guide: %s, topic: %s", guide_id, guide.get('topic', 'unknown'))
                 
-            # Create a new research session for the subtopic
-            subtopic_session_id = await db_service.store_research({
-                "topic": data['topic'],
-                "parent_guide_id": guide_id, 
-                "status": "initializing",
-                "metadata": {"created": datetime.utcnow(), "updated": datetime.utcnow()},
-                "trees": {}
-            })
-            logger.debug(f"[DEBUG] Created new research session for subtopic: {subtopic_session_id}")
+            # The subtopic's session document is written once, after research, under a
+            # pre-generated ID (the placeholder insert and the results update were two writes)
+            subtopic_session_id = str(ObjectId())
             
-            # Enable only the specified AI for research
-            logger.debug(f"[DEBUG] Available AI members: {list(council.members.keys())}")
-            for member_name in council.members:
-                enabled = (member_name == data["ai"])
-                council.members[member_name]["enabled"] = enabled
-                logger.debug(f"[DEBUG] AI {member_name} enabled: {enabled}")
-                
             # Conduct research
-            logger.debug(f"[DEBUG] Starting research for topic: {data['topic']}")
-            research_results_obj = await council.conduct_research(data["topic"], session_id=subtopic_session_id)
-            logger.debug(f"[DEBUG] Research completed for subtopic session: {subtopic_session_id}")
+            logger.debug("Starting research for topic: %s", data['topic'])
+            # The response carries the new node's research, so this one stays inline,
+            # but it still shares the concurrency cap with background research
+            async with research_slots:
+                # Only the requested AI researches this subtopic; shared member flags are left untouched
+                research_results_obj = await council.conduct_research(data["topic"], session_id=subtopic_session_id, enabled={data["ai"]})
+            logger.debug("Research completed for subtopic session: %s", subtopic_session_id)
             
-            # Store research results
-            logger.debug(f"[DEBUG] Storing research results")
+            # Store the subtopic session with its results (upserts the session document)
+            logger.debug("Storing research results")
             await db_service.store_research(research_results_obj.to_dict() if hasattr(research_results_obj, 'to_dict') else research_results_obj, subtopic_session_id)
-            logger.debug(f"[DEBUG] Research results stored successfully")
+            logger.debug("Research results stored successfully")
             
             # Create node with generated results
             ai_results = research_results_obj.get("trees", {}).get(data["ai"], {})
-            logger.debug(f"[DEBUG] Retrieved AI results for {data['ai']}")
+            logger.debug("Retrieved AI results for %s", data['ai'])
             
             new_node = {
                 "node_id": subtopic_session_id,
@@ -245,30 +346,32 @@ def create_app():
                 "research": ai_results.get("research", {}),
                 "children": []
             }
-            logger.debug(f"[DEBUG] Created new node: {new_node}")
+            logger.debug("Created new node: %s", new_node)
             
             # Add node to parent's children
-            logger.debug(f"[DEBUG] Adding subtopic node to guide {guide_id}, AI {data['ai']}, parent node {data['parent_node_id']}")
+            logger.debug("Adding subtopic node to guide %s, AI %s, parent node %s", guide_id, data['ai'], data['parent_node_id'])
             result = await db_service.add_subtopic_node(guide_id, data["ai"], data["parent_node_id"], new_node)
-            logger.debug(f"[DEBUG] Add subtopic node result: {result}")
+            logger.debug("Add subtopic node result: %s", result)
             
-            logger.debug(f"[DEBUG] Returning successful response with new node")
+            logger.debug("Returning successful response with new node")
             return jsonify({
                 "status": "success", 
                 "node": new_node
             })
         except Exception as e:
-            logger.error(f"[DEBUG] Error researching subtopic: {str(e)}", exc_info=True)
+            logger.error("Error researching subtopic: %s", e, exc_info=True)
             return jsonify({"error": str(e), "status": "error"}), 500
 
-    print("[DEBUG app.py] create_app finished.")
+    logger.debug("create_app finished.")
     return app
 
 if __name__ == "__main__":
-    print("[DEBUG app.py] Starting __main__ block.")
+    logger.debug("Starting __main__ block.")
+    install_event_loop_policy()
     app = create_app()
-    print(f"[DEBUG app.py] Final app.config before run, PROVIDE_AUTOMATIC_OPTIONS: {app.config.get('PROVIDE_AUTOMATIC_OPTIONS')}")
-    app.run(debug=True, use_reloader=True)
+    logger.debug("Final app.config before run, PROVIDE_AUTOMATIC_OPTIONS: %s", app.config.get('PROVIDE_AUTOMATIC_OPTIONS'))
+    debug_mode = os.environ.get('AI_COUNCIL_DEBUG', 'true').lower() == 'true'
+    app.run(debug=debug_mode, use_reloader=debug_mode)
 
     # Use a production-ready ASGI server like Hypercorn directly for Quart in production
     # For development, app.run() is okay but ensure it's using an ASGI loop.
@@ -1,35 +1,163 @@
 """
 Research Blueprint for AI Council Guide Creation Website
+
+Subtopic and tree lookups filter on parent_id, so the blueprint creates
+(parent_id, status) indexes on guides and topics before serving.
 """
-from quart import Blueprint, jsonify, request, current_app, render_template
+from quart import Blueprint, jsonify, request, current_app, render_template, url_for, make_response
 from bson.objectid import ObjectId
-import json
-import re
+from pymongo import UpdateOne, IndexModel
+from pymongo.write_concern import WriteConcern
+import orjson
+import string
+# RE2 guarantees linear-time matching on user-supplied topics; the topic pattern
+# sticks to syntax both engines accept, so the stdlib module is a drop-in fallback
+try:
+    import re2 as re
+except ImportError:
+    import re
 import asyncio
-from datetime import datetime
-from typing import Dict, Any, Optional
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from collections import defaultdict
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Handlers and levels are configured by the app entry point
 logger = logging.getLogger(__name__)
 
-# Import the research chain
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
-from src.langchain.chains.research_services import ResearchService
-from src.database.mongodb import get_database
-from ..models.research import ResearchTopic
-from ...langchain.chains.research_base import ResearchResult, ResearchError
+from src.database.mongodb import get_async_database
+from ..models.research_topic import ResearchTopic
+from ...langchain.chains.research_base import ResearchConfig, ResearchResult, ResearchError, research_slots
+from ...langchain.chains.research_cache import research_cache
+
+# Create blueprint; the prefix lives here so every app mounts it at the same place
+research_bp = Blueprint('research', __name__, url_prefix='/api')
+
+# The "initializing" stub is cheap to recreate, so it skips the journal commit wait;
+# the completion update keeps the default write concern
+_STUB_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Background research tasks, held strongly so they are not garbage collected mid-flight,
+# each with the collection, document ID and update-time field it records its outcome in
+_BG_TASKS: Dict[asyncio.Task, Tuple[str, str, str]] = {}
+# How long shutdown waits for background research before cancelling it. This plus the
+# failure writes must fit in the server's graceful shutdown window (3 s in Hypercorn)
+_DRAIN_SECONDS = float(os.environ.get("RESEARCH_DRAIN_TIMEOUT", "2"))
+_INTERRUPTED_MESSAGE = "Research was interrupted by a server shutdown"
+
+# Subscriber queues for each document's research status stream, keyed by document ID
+_RESEARCH_STREAMS: Dict[str, set] = defaultdict(set)
+_FINISHED_STATUSES = frozenset({"completed", "failed"})
+# Research may run in another worker or have been lost in a restart, so an idle stream
+# re-reads the status from Mongo this often, and no stream stays open longer than the cap
+_STREAM_RECHECK_SECONDS = 15
+_STREAM_MAX_SECONDS = 30 * 60
+
+def parse_oid(value: str) -> Optional[ObjectId]:
+    """Parse an ObjectId string, returning None for malformed IDs instead of raising"""
+    if not ObjectId.is_valid(value):
+        return None
+    return ObjectId(value)
+
+def publish_research_event(doc_id: str, event: Dict[str, Any]):
+    """Hand a research status event to everyone streaming this document"""
+    for queue in _RESEARCH_STREAMS.get(doc_id, ()):
+        queue.put_nowait(event)
+
+def spawn_research_task(coro, collection_name: str, doc_id: str, updated_field: str) -> asyncio.Task:
+    """Run research for a document in the background, keeping the task alive until it finishes"""
+    task = asyncio.create_task(coro)
+    _BG_TASKS[task] = (collection_name, doc_id, updated_field)
+    task.add_done_callback(lambda done: _BG_TASKS.pop(done, None))
+    return task
 
-# Create blueprint
-research_bp = Blueprint('research', __name__)
+@lru_cache(maxsize=None)
+def get_research_service():
+    """Shared ResearchService, built on first use so read-only routes never load LangChain"""
+    from ...langchain.chains.research_services import ResearchService
+    return ResearchService(ResearchConfig.from_config())
+
+async def research_topic_cached(topic: str, doc_id: str) -> Dict[str, Any]:
+    """Research a topic, reusing a recent or in-flight result for the same normalized topic"""
+    async def compute() -> Dict[str, Any]:
+        async with research_slots:
+            return await get_research_service().research_topic(topic, doc_id)
+            
+    research = await research_cache.get_or_compute(topic, compute)
+    logger.debug("Research cache stats: %s", research_cache.stats())
+    return research
+
+def register_research_routes(app):
+    """Mount the research routes on an app"""
+    app.register_blueprint(research_bp)
+
+@research_bp.before_app_serving
+async def warm_research_service():
+    """Build the shared ResearchService before the first request"""
+    try:
+        # Handlers and background tasks all go through the cached get_research_service()
+        get_research_service()
+    except Exception as e:
+        # Research routes retry the build on first use and report the error there
+        logger.warning("Failed to build research service at startup: %s", e)
+
+@research_bp.before_app_serving
+async def ensure_parent_indexes():
+    """Create the parent_id indexes the subtopic and tree queries rely on"""
+    db = get_async_database()
+    try:
+        # The compound indexes also serve parent_id-only lookups through their prefix
+        await db.guides.create_indexes([IndexModel([("parent_id", 1), ("status", 1)])])
+        await db.topics.create_indexes([IndexModel([("parent_id", 1), ("status", 1)])])
+    except Exception as e:
+        # Queries still work without the indexes, just more slowly
+        logger.warning("Failed to ensure parent_id indexes: %s", e)
+
+@research_bp.after_app_serving
+async def drain_research_tasks():
+    """Give in-flight background research a short grace period, then cancel what is left and mark it failed"""
+    if not _BG_TASKS:
+        return
+    logger.debug("Waiting for %s background research tasks", len(_BG_TASKS))
+    _, pending = await asyncio.wait(set(_BG_TASKS), timeout=_DRAIN_SECONDS)
+    if not pending:
+        return
+        
+    logger.warning("Cancelling %s unfinished background research tasks", len(pending))
+    interrupted = defaultdict(list)
+    for task in pending:
+        collection_name, doc_id, updated_field = _BG_TASKS[task]
+        interrupted[collection_name, updated_field].append(doc_id)
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    
+    # One write per collection; documents that finished while being cancelled keep their status
+    db = get_async_database()
+    now = datetime.now(timezone.utc)
+    for (collection_name, updated_field), doc_ids in interrupted.items():
+        try:
+            await db[collection_name].update_many(
+                {
+                    "_id": {"$in": [ObjectId(doc_id) for doc_id in doc_ids]},
+                    "status": {"$nin": list(_FINISHED_STATUSES)}
+                },
+                {"$set": {
+                    "status": "failed",
+                    "status_message": _INTERRUPTED_MESSAGE,
+                    updated_field: now
+                }}
+            )
+        except Exception as e:
+            logger.error("Failed to mark interrupted %s as failed: %s", collection_name, e)
+        for doc_id in doc_ids:
+            publish_research_event(doc_id, {"id": doc_id, "status": "failed", "message": _INTERRUPTED_MESSAGE})
 
 @research_bp.errorhandler(Exception)
 async def handle_error(error):
     """Global error handler for the research blueprint"""
-    logger.error(f"Research error: {str(error)}", exc_info=True)
+    logger.error("Research error: %s", error, exc_info=True)
     return jsonify({
         "status": "error",
         "message": str(error)
@@ -42,188 +170,161 @@ async def start_research():
         data = await request.get_json()
         topic = data.get('topic')
         
-        if not topic:
+        validation_error = validate_topic(topic)
+        if validation_error:
             return jsonify({
                 'status': 'error',
-                'message': 'Topic is required'
+                'message': validation_error
             }), 400
             
-        # Configure research
-        from ...config import (
-            OPENAI_KEY, OPENAI_API_BASE, 
-            GOOGLE_SEARCH_API_KEY, GOOGLE_SEARCH_ENGINE_ID,
-            GEMINI_API_KEY, XAI_API_KEY, MONGO_URI
-        )
-        from ...langchain.chains.research_base import ResearchConfig
-        
-        # Create research config
-        research_config = ResearchConfig(
-            openai_api_key=OPENAI_KEY,
-            anthropic_api_key="",
-            google_api_key=GEMINI_API_KEY,
-            XAI_API_KEY=XAI_API_KEY,
-            google_search_api_key=GOOGLE_SEARCH_API_KEY,
-            google_search_engine_id=GOOGLE_SEARCH_ENGINE_ID,
-            mongo_connection=MONGO_URI,
-            OPENAI_API_BASE=OPENAI_API_BASE
-        )
-        
-        # Initialize research service
-        research_service = ResearchService(research_config)
-        
         # Create guide
-        db = get_database()
-        logger.debug(f"Creating new guide for topic: {topic}")
-        result = await db.guides.insert_one({
+        db = get_async_database()
+        now = datetime.now(timezone.utc)
+        guide_oid = ObjectId()
+        guide_id = str(guide_oid)
+        logger.debug("Creating guide %s for topic: %s", guide_id, topic)
+        stub_guides = db.guides.with_options(write_concern=_STUB_WRITE_CONCERN)
+        await stub_guides.insert_one({
+            "_id": guide_oid,
             "topic": topic,
             "status": "initializing",
             "metadata": {
-                "created": datetime.utcnow(),
-                "updated": datetime.utcnow(),
+                "created": now,
+                "updated": now,
                 "ais": ["grok"],  # Initially only Grok is enabled
                 "depth": 0
             }
         })
-        guide_id = str(result.inserted_id)
-        logger.debug(f"Created guide with ID: {guide_id}")
         
-        # Run research
-        logger.debug(f"Starting research for guide_id: {guide_id}")
-        research = await research_service.research_topic(topic, guide_id)
-        logger.debug(f"Research completed for guide_id: {guide_id}")
-        
-        # Update guide with research results
-        logger.debug(f"Updating guide {guide_id} with research results")
-        await db.guides.update_one(
-            {"_id": ObjectId(guide_id)},
-            {
-                "$set": {
-                    "status": "completed",
-                    "trees": research.get("trees", {}),
-                    "metadata.updated": datetime.utcnow()
-                }
-            }
-        )
-        logger.debug(f"Guide {guide_id} updated successfully")
+        # Research runs in the background and records its outcome on the guide;
+        # clients poll the guide (named in the Location header) for progress
+        logger.debug("Scheduling research for guide_id: %s", guide_id)
+        spawn_research_task(run_guide_research(guide_id), "guides", guide_id, "metadata.updated")
         
         return jsonify({
-            "status": "success",
+            "status": "initializing",
             "guide_id": guide_id
-        })
+        }), 202, {"Location": url_for('research.research_page', guide_id=guide_id)}
         
     except Exception as e:
-        logger.error(f"Research failed: {str(e)}", exc_info=True)
+        logger.error("Research failed: %s", e, exc_info=True)
         return jsonify({
             "status": "error",
             "message": str(e)
         }), 500
 
-# @research_bp.route('/research/results/<guide_id>', methods=['GET'])
-# async def get_research_results(guide_id):
-#     """Get research results"""
-#     try:
-#         db = get_database()
-#         guide = await db.guides.find_one({"_id": ObjectId(guide_id)})
-        
-#         if not guide:
-#             return jsonify({
-#                 'status': 'error',
-#                 'message': 'Guide not found'
-#             }), 404
-            
-#         # Return trees for new format or research for legacy
-#         result = {
-#             "status": guide.get("status", "completed"),
-#         }
-        
-#         if "trees" in guide:
-#             result["trees"] = guide["trees"]
-#         elif "research" in guide:
-#             result["research"] = guide["research"]
-            
-#         return jsonify(result)
-            
-#     except Exception as e:
-#         return jsonify({
-#             'status': 'error',
-#             'message': str(e)
-#         }), 500
-
-# @research_bp.route('/research/subtopic', methods=['POST'])
-# async def research_subtopic():
-#     """Research a subtopic"""
-#     try:
-#         data = await request.get_json()
-#         topic = data.get('topic')
-#         ai = data.get('ai')
-#         guide_id = data.get('guide_id')
-#         parent_node_id = data.get('parent_node_id')
-        
-#         if not all([topic, ai, guide_id, parent_node_id]):
-#             return jsonify({
-#                 'status': 'error',
-#                 'message': 'Topic, AI, guide_id, and parent_node_id are required'
-#             }), 400
-            
-#         # Configure research
-#         from ...config import (
-#             OPENAI_KEY, OPENAI_API_BASE, 
-#             GOOGLE_SEARCH_API_KEY, GOOGLE_SEARCH_ENGINE_ID,
-#             GEMINI_API_KEY, XAI_API_KEY, MONGO_URI
-#         )
-#         from ...langchain.chains.research_base import ResearchConfig
-        
-#         # Create research config
-#         research_config = ResearchConfig(
-#             openai_api_key=OPENAI_KEY,
-#             anthropic_api_key="",
-#             google_api_key=GEMINI_API_KEY,
-#             XAI_API_KEY=XAI_API_KEY,
-#             google_search_api_key=GOOGLE_SEARCH_API_KEY,
-#             google_search_engine_id=GOOGLE_SEARCH_ENGINE_ID,
-#             mongo_connection=MONGO_URI,
-#             OPENAI_API_BASE=OPENAI_API_BASE
-#         )
-        
-#         # Initialize research service
-#         research_service = ResearchService(research_config)
-        
-#         # Run research for the subtopic
-#         new_node = await research_service.research_subtopic(topic, ai, guide_id, parent_node_id)
-        
-#         # Add new node to the tree
-#         db_service = research_service.db_service
-#         success = await db_service.add_subtopic_node(guide_id, ai, parent_node_id, new_node)
-        
-#         if not success:
-#             return jsonify({
-#                 'status': 'error',
-#                 'message': 'Failed to add subtopic node to tree'
-#             }), 500
-            
-#         return jsonify({
-#             'status': 'success',
-#             'message': 'Subtopic research completed successfully',
-#             'node': new_node
-#         })
-            
-#     except Exception as e:
-#         return jsonify({
-#             'status': 'error',
-#             'message': str(e)
-#         }), 500
+@research_bp.route('/cache/stats', methods=['GET'])
+async def get_cache_stats():
+    """Report research cache hit, miss and coalesced request counts"""
+    return jsonify({
+        'status': 'success',
+        'research_cache': research_cache.stats()
+    })
 
 @research_bp.route('/guide/<id>/research', methods=['GET'])
 async def render_research_page(id):
     """Render the research page"""
     return await render_template("research.html", guide_id=id)
 
+@research_bp.route('/<guide_id>/stream', methods=['GET'])
+async def stream_research(guide_id: str):
+    """Stream a guide's research status as server-sent events until research finishes"""
+    guide_oid = parse_oid(guide_id)
+    if guide_oid is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid guide ID'
+        }), 400
+        
+    try:
+        # Subscribe before reading the current status so no event falls in between
+        queue = asyncio.Queue()
+        _RESEARCH_STREAMS[guide_id].add(queue)
+        db = get_async_database()
+        guide = await db.guides.find_one(
+            {"_id": guide_oid},
+            {"status": 1, "status_message": 1}
+        )
+    except Exception as e:
+        _unsubscribe(guide_id, queue)
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+        
+    if not guide:
+        _unsubscribe(guide_id, queue)
+        return jsonify({
+            'status': 'error',
+            'message': 'Guide not found'
+        }), 404
+        
+    def status_event(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": guide_id,
+            "status": doc.get("status"),
+            "message": doc.get("status_message")
+        }
+        
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _STREAM_MAX_SECONDS
+        try:
+            event = status_event(guide)
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+            while event["status"] not in _FINISHED_STATUSES:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    next_event = await asyncio.wait_for(queue.get(), min(_STREAM_RECHECK_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    current = await db.guides.find_one(
+                        {"_id": guide_oid},
+                        {"status": 1, "status_message": 1}
+                    )
+                    if current is None:
+                        break
+                    next_event = status_event(current)
+                    if next_event == event:
+                        # Comment line: keeps proxies from closing an idle connection
+                        yield b": keep-alive\n\n"
+                        continue
+                event = next_event
+                # Partial events carry research trees, which may hold dates or ObjectIds
+                yield b"data: " + orjson.dumps(event, default=str) + b"\n\n"
+        finally:
+            _unsubscribe(guide_id, queue)
+            
+    response = await make_response(events(), 200, {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache"
+    })
+    # Research can outlast Quart's default response timeout; the stream enforces its own cap
+    response.timeout = None
+    return response
+
+def _unsubscribe(doc_id: str, queue: asyncio.Queue):
+    """Stop delivering a document's research events to a queue"""
+    queues = _RESEARCH_STREAMS.get(doc_id)
+    if queues is not None:
+        queues.discard(queue)
+        if not queues:
+            del _RESEARCH_STREAMS[doc_id]
+
 @research_bp.route('/topics/<topic_id>/research', methods=['POST'])
 async def start_topic_research(topic_id):
     """Start research for a specific topic"""
+    topic_oid = parse_oid(topic_id)
+    if topic_oid is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid topic ID'
+        }), 400
+        
     try:
-        db = get_database()
-        topic = await db.topics.find_one({"_id": ObjectId(topic_id)})
+        db = get_async_database()
+        topic = await db.topics.find_one({"_id": topic_oid}, {"_id": 1})
         
         if not topic:
             return jsonify({
@@ -232,7 +333,7 @@ async def start_topic_research(topic_id):
             }), 404
             
         # Start research in background
-        asyncio.create_task(run_topic_research(topic_id))
+        spawn_research_task(run_topic_research(topic_id), "topics", topic_id, "updated")
         
         return jsonify({
             'status': 'success',
@@ -245,69 +346,111 @@ async def start_topic_research(topic_id):
             'message': str(e)
         }), 500
 
+# Topic validation rules, mirroring validateInput() in static/js/topicInput.js.
+# The deletion table strips every allowed character; anything left over is invalid.
+_TOPIC_ALLOWED_CHARS = string.ascii_letters + string.digits + string.whitespace + ".,?!'\"():-"
+_TOPIC_DEL_TABLE = str.maketrans('', '', _TOPIC_ALLOWED_CHARS)
+_MIN_WORDS = 3
+_MIN_TOPIC_LEN = 10
+_MAX_TOPIC_LEN = 100
+_MAX_WORD_LEN = 30
+# Leaves room for surrounding whitespace; anything longer is rejected before it is cached
+_MAX_RAW_TOPIC_LEN = 1000
+# A trimmed topic passing every content check: at least _MIN_WORDS words of up to
+# _MAX_WORD_LEN allowed characters, separated by whitespace. Lengths are checked separately.
+# The input is already trimmed, so $ can only match at the very end.
+_TOPIC_WORD = r"[A-Za-z0-9.,?!'\"():\-]{1,%d}" % _MAX_WORD_LEN
+_VALID_TOPIC_RE = re.compile(
+    r"\A(?:%s[ \t\n\r\x0b\x0c]+){%d,}%s$" % (_TOPIC_WORD, _MIN_WORDS - 1, _TOPIC_WORD)
+)
+
 def validate_topic(topic: str) -> Optional[str]:
-    """Validate a research topic"""
-    if not topic or len(topic.strip()) == 0:
+    """Validate a research topic, returning an error message or None if it is valid"""
+    if topic is None:
         return "Topic cannot be empty"
-    if len(topic) > 500:
-        return "Topic is too long (max 500 characters)"
-    return None
+    # JSON bodies can carry any type; the checks below (and the cache key) need a string
+    if not isinstance(topic, str):
+        return "Topic must be a string"
+    if not topic or topic.isspace():
+        return "Topic cannot be empty"
+    if len(topic) > _MAX_RAW_TOPIC_LEN:
+        return "Topic too long. Please limit to 100 characters."
+    return _validate_topic_text(topic)
 
-async def get_topic_depth(db, parent_id: str) -> int:
-    """Get the depth of a topic in the research tree"""
-    depth = 0
-    current_id = parent_id
+@lru_cache(maxsize=2048)
+def _validate_topic_text(topic: str) -> Optional[str]:
+    """Content checks for a non-blank topic of bounded length"""
+    trimmed_topic = topic.strip()
+    # Valid topics pass in one regex match; only rejected ones are split apart to
+    # find the message that applies
+    if _MIN_TOPIC_LEN <= len(trimmed_topic) <= _MAX_TOPIC_LEN and _VALID_TOPIC_RE.match(trimmed_topic):
+        return None
+        
+    words = trimmed_topic.split()
     
-    while current_id:
-        parent = await db.guides.find_one({"_id": ObjectId(current_id)})
-        if not parent or not parent.get("parent_id"):
-            break
-        current_id = parent["parent_id"]
-        depth += 1
+    if len(words) < _MIN_WORDS:
+        return "Topic too vague. Please provide at least 3 words."
+    if len(trimmed_topic) > _MAX_TOPIC_LEN:
+        return "Topic too long. Please limit to 100 characters."
+    if trimmed_topic.translate(_TOPIC_DEL_TABLE):
+        return "Topic contains invalid characters. Please use only letters, numbers, and basic punctuation."
+    if len(trimmed_topic) < _MIN_TOPIC_LEN:
+        return "Topic too short. Please be more specific (at least 10 characters)."
+        
+    if max(map(len, words)) > _MAX_WORD_LEN:
+        long_word = next(word for word in words if len(word) > _MAX_WORD_LEN)
+        return f'Word "{long_word[:10]}..." is too long. Please use natural language.'
+    return None
+
+async def get_topic_depth(db, parent_oid: Optional[ObjectId]) -> Optional[int]:
+    """Get the depth of a topic in the topic tree from its parent's stored depth, or None if the parent is missing"""
+    if parent_oid is None:
+        return 0
+        
+    parent = await db.topics.find_one({"_id": parent_oid}, {"depth": 1})
+    if not parent:
+        return None
         
-    return depth
+    # Topics stored before depth was recorded count as top-level parents
+    return parent.get("depth", 0) + 1
 
-async def run_topic_research(topic_id: str):
-    """Run research for a topic in the background"""
+async def _run_research_into(collection, doc_id: str, name_field: str, updated_field: str):
+    """Research the topic stored on a document and record the outcome on that document"""
+    doc_oid = ObjectId(doc_id)
     try:
-        db = get_database()
-        topic = await db.topics.find_one({"_id": ObjectId(topic_id)})
+        doc = await collection.find_one({"_id": doc_oid}, {name_field: 1})
         
-        if not topic:
-            logger.error(f"Topic not found: {topic_id}")
+        if not doc:
+            logger.error("%s document not found: %s", collection.name, doc_id)
             return
             
-        # Initialize research service
-        research_service = ResearchService(ResearchConfig.from_config())
-        
         # Run research
-        research = await research_service.research_topic(topic["name"], topic_id)
-        
-        # Update topic with research results
-        await db.topics.update_one(
-            {"_id": ObjectId(topic_id)},
-            {
-                "$set": {
-                    "status": "completed",
-                    "research": research.to_dict(),
-                    "updated": datetime.utcnow()
-                }
-            }
-        )
+        publish_research_event(doc_id, {"id": doc_id, "status": "running"})
+        research = await research_topic_cached(doc[name_field], doc_id)
+        update = {
+            "status": "completed",
+            "trees": research.get("trees", {})
+        }
         
     except Exception as e:
-        logger.error(f"Research failed for topic {topic_id}: {str(e)}", exc_info=True)
-        # Update topic with error status
-        await db.topics.update_one(
-            {"_id": ObjectId(topic_id)},
-            {
-                "$set": {
-                    "status": "error",
-                    "error": str(e),
-                    "updated": datetime.utcnow()
-                }
-            }
-        )
+        logger.error("Research failed for %s %s: %s", collection.name, doc_id, e, exc_info=True)
+        # Same failure shape as the app-level research task, so the results poll reports it
+        update = {
+            "status": "failed",
+            "status_message": str(e)
+        }
+        
+    update[updated_field] = datetime.now(timezone.utc)
+    await collection.update_one({"_id": doc_oid}, {"$set": update})
+    publish_research_event(doc_id, {
+        "id": doc_id,
+        "status": update["status"],
+        "message": update.get("status_message")
+    })
+
+async def run_topic_research(topic_id: str):
+    """Run research for a topic in the background"""
+    await _run_research_into(get_async_database().topics, topic_id, "name", "updated")
 
 @research_bp.route('/topics', methods=['POST'])
 async def add_topic():
@@ -317,13 +460,6 @@ async def add_topic():
         name = data.get('name')
         parent_id = data.get('parent_id')
         
-        if not name:
-            return jsonify({
-                'status': 'error',
-                'message': 'Topic name is required'
-            }), 400
-            
-        # Validate topic
         validation_error = validate_topic(name)
         if validation_error:
             return jsonify({
@@ -331,14 +467,32 @@ async def add_topic():
                 'message': validation_error
             }), 400
             
+        parent_oid = None
+        if parent_id:
+            parent_oid = parse_oid(parent_id)
+            if parent_oid is None:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Invalid parent ID'
+                }), 400
+                
+        db = get_async_database()
+        depth = await get_topic_depth(db, parent_oid)
+        if depth is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Parent topic not found'
+            }), 404
+            
         # Create topic document
-        db = get_database()
+        now = datetime.now(timezone.utc)
         topic = {
             "name": name,
             "parent_id": parent_id,
+            "depth": depth,
             "status": "pending",
-            "created": datetime.utcnow(),
-            "updated": datetime.utcnow()
+            "created": now,
+            "updated": now
         }
         
         result = await db.topics.insert_one(topic)
@@ -358,9 +512,16 @@ async def add_topic():
 @research_bp.route('/topics/<topic_id>', methods=['GET'])
 async def get_topic(topic_id):
     """Get a specific topic"""
+    topic_oid = parse_oid(topic_id)
+    if topic_oid is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid topic ID'
+        }), 400
+        
     try:
-        db = get_database()
-        topic = await db.topics.find_one({"_id": ObjectId(topic_id)})
+        db = get_async_database()
+        topic = await db.topics.find_one({"_id": topic_oid})
         
         if not topic:
             return jsonify({
@@ -383,24 +544,22 @@ async def get_topic(topic_id):
 async def get_topic_tree():
     """Get the complete topic tree"""
     try:
-        db = get_database()
-        topics = await db.topics.find().to_list(length=None)
-        
-        # Build tree structure
-        def build_tree(topics, parent_id=None):
-            tree = []
-            for topic in topics:
-                if topic.get('parent_id') == parent_id:
-                    node = {
-                        'id': str(topic['_id']),
-                        'name': topic['name'],
-                        'status': topic['status'],
-                        'children': build_tree(topics, str(topic['_id']))
-                    }
-                    tree.append(node)
-            return tree
+        db = get_async_database()
+        topics = await db.topics.find({}, {"name": 1, "status": 1, "parent_id": 1}).to_list(length=None)
+        
+        # Build tree structure in one pass: each node's children list is the
+        # group its own children get appended to, whatever order topics arrive in
+        children_by_parent = defaultdict(list)
+        for topic in topics:
+            topic_id = str(topic['_id'])
+            children_by_parent[topic.get('parent_id')].append({
+                'id': topic_id,
+                'name': topic['name'],
+                'status': topic['status'],
+                'children': children_by_parent[topic_id]
+            })
             
-        tree = build_tree(topics)
+        tree = children_by_parent[None]
         
         return jsonify({
             'status': 'success',
@@ -413,103 +572,133 @@ async def get_topic_tree():
             'message': str(e)
         }), 500
 
-# @research_bp.route('/<guide_id>/subtopics', methods=['POST'])
-# async def research_subtopics(guide_id: str):
-#     """Research subtopics for a guide"""
-#     try:
-#         data = await request.get_json()
-#         subtopics = data.get('subtopics', [])
-        
-#         if not subtopics:
-#             return jsonify({
-#                 'status': 'error',
-#                 'message': 'No subtopics provided'
-#             }), 400
+@research_bp.route('/<guide_id>/subtopics', methods=['POST'])
+async def research_subtopics(guide_id: str):
+    """Research subtopics for a guide"""
+    # Parsed once and reused for every query against the parent
+    guide_oid = parse_oid(guide_id)
+    if guide_oid is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid guide ID'
+        }), 400
+        
+    try:
+        data = await request.get_json()
+        subtopics = data.get('subtopics', [])
+        
+        if not subtopics:
+            return jsonify({
+                'status': 'error',
+                'message': 'No subtopics provided'
+            }), 400
             
-#         db = get_database()
-#         guide = await db.guides.find_one({"_id": ObjectId(guide_id)})
-        
-#         if not guide:
-#             return jsonify({
-#                 'status': 'error',
-#                 'message': 'Guide not found'
-#             }), 404
+        db = get_async_database()
+        guide = await db.guides.find_one({"_id": guide_oid}, {"metadata.depth": 1})
+        
+        if not guide:
+            return jsonify({
+                'status': 'error',
+                'message': 'Guide not found'
+            }), 404
             
-#         # Initialize research service
-#         research_service = ResearchService(ResearchConfig.from_config())
-        
-#         # Research each subtopic
-#         results = []
-#         for subtopic in subtopics:
-#             try:
-#                 # Create subtopic guide
-#                 subtopic_guide = {
-#                     "topic": subtopic,
-#                     "parent_id": guide_id,
-#                     "status": "initializing",
-#                     "metadata": {
-#                         "created": datetime.utcnow(),
-#                         "updated": datetime.utcnow(),
-#                         "ais": ["Claude", "ChatGPT", "Gemini", "Grok"],
-#                         "depth": guide.get("metadata", {}).get("depth", 0) + 1
-#                     }
-#                 }
-                
-#                 result = await db.guides.insert_one(subtopic_guide)
-#                 subtopic_id = str(result.inserted_id)
-                
-#                 # Run research
-#                 research = await research_service.research_topic(subtopic, subtopic_id)
+        # IDs are generated client-side so each subtopic guide is written once, with its
+        # research outcome, and the parent can reference it in the same round trip.
+        # research_topic may already have stored a guide under the ID, so the write upserts.
+        now = datetime.now(timezone.utc)
+        depth = guide.get("metadata", {}).get("depth", 0) + 1
+        subtopic_oids = [ObjectId() for _ in subtopics]
+        
+        # Research the subtopics concurrently; research_topic_cached applies the shared cap
+        async def research_one(subtopic: str, subtopic_oid: ObjectId) -> Dict[str, Any]:
+            """Research one subtopic and describe the fields that record its outcome"""
+            subtopic_id = str(subtopic_oid)
+            try:
+                research = await research_topic_cached(subtopic, subtopic_id)
                 
-#                 # Update guide with research results
-#                 await db.guides.update_one(
-#                     {"_id": ObjectId(subtopic_id)},
-#                     {
-#                         "$set": {
-#                             "status": "completed",
-#                             "research": research.to_dict(),
-#                             "metadata.updated": datetime.utcnow()
-#                         }
-#                     }
-#                 )
-                
-#                 # Add to parent's children
-#                 await db.guides.update_one(
-#                     {"_id": ObjectId(guide_id)},
-#                     {"$push": {"children": subtopic_id}}
-#                 )
+                return {
+                    "subtopic": subtopic,
+                    "guide_id": subtopic_id,
+                    "status": "success",
+                    "outcome": {
+                        "status": "completed",
+                        "trees": research.get("trees", {})
+                    }
+                }
                 
-#                 results.append({
-#                     "subtopic": subtopic,
-#                     "guide_id": subtopic_id,
-#                     "status": "success"
-#                 })
+            except Exception as e:
+                logger.error("Failed to research subtopic %s: %s", subtopic, e, exc_info=True)
+                return {
+                    "subtopic": subtopic,
+                    "guide_id": subtopic_id,
+                    "status": "error",
+                    "error": str(e),
+                    "outcome": {
+                        "status": "failed",
+                        "status_message": str(e)
+                    }
+                }
                 
-#             except Exception as e:
-#                 logger.error(f"Failed to research subtopic {subtopic}: {str(e)}", exc_info=True)
-#                 results.append({
-#                     "subtopic": subtopic,
-#                     "status": "error",
-#                     "error": str(e)
-#                 })
-        
-#         return jsonify({
-#             'status': 'success',
-#             'results': results
-#         })
+        results = await asyncio.gather(*(
+            research_one(subtopic, subtopic_oid)
+            for subtopic, subtopic_oid in zip(subtopics, subtopic_oids)
+        ))
+        
+        # Write every finished subtopic guide and append the successful ones to the
+        # parent's children in a single round trip
+        finished = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": subtopic_oid},
+                {
+                    "$set": {
+                        "topic": result["subtopic"],
+                        "parent_id": guide_id,
+                        **result.pop("outcome"),
+                        "metadata.updated": finished,
+                        "metadata.depth": depth
+                    },
+                    "$setOnInsert": {
+                        "metadata.created": now,
+                        "metadata.ais": ["Claude", "ChatGPT", "Gemini", "Grok"]
+                    }
+                },
+                upsert=True
+            )
+            for result, subtopic_oid in zip(results, subtopic_oids)
+        ]
+        completed_ids = [result["guide_id"] for result in results if result["status"] == "success"]
+        if completed_ids:
+            operations.append(UpdateOne(
+                {"_id": guide_oid},
+                {"$push": {"children": {"$each": completed_ids}}}
+            ))
+        await db.guides.bulk_write(operations, ordered=False)
+        
+        return jsonify({
+            'status': 'success',
+            'results': results
+        })
             
-#     except Exception as e:
-#         return jsonify({
-#             'status': 'error',
-#             'message': str(e)
-#         }), 500
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
 
 @research_bp.route('/<guide_id>', methods=['GET'])
 async def research_page(guide_id: str):
-    """Get the research page for a guide"""
+    """Get the research page for a guide; ?shallow=1 lists descendants without their research"""
+    guide_oid = parse_oid(guide_id)
+    if guide_oid is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid guide ID'
+        }), 400
+        
     try:
-        db = get_database()
-        guide = await db.guides.find_one({"_id": ObjectId(guide_id)})
+        db = get_async_database()
+        guide = await db.guides.find_one({"_id": guide_oid})
         
         if not guide:
             return jsonify({
@@ -517,16 +706,31 @@ async def research_page(guide_id: str):
                 'message': 'Guide not found'
             }), 404
             
-        # Get all children recursively
-        async def get_children(parent_id):
-            children = []
-            cursor = db.guides.find({"parent_id": parent_id})
-            async for child in cursor:
-                child['children'] = await get_children(str(child['_id']))
-                children.append(child)
-            return children
-            
-        guide['children'] = await get_children(guide_id)
+        # Get all descendants one tree level per query. parent_id holds the parent's
+        # ID as a string, so $graphLookup cannot follow it from the ObjectId _id.
+        # Shallow listings leave out the descendants' research payloads; each one's
+        # research is then served by /api/research/results/<guide_id>
+        shallow = request.args.get('shallow', '').lower() in ('1', 'true')
+        projection = {"trees": 0, "research": 0} if shallow else None
+        children_by_parent = defaultdict(list)
+        seen = {guide_id}
+        frontier = [guide_id]
+        while frontier:
+            level = await db.guides.find(
+                {"parent_id": {"$in": frontier}},
+                projection
+            ).to_list(length=None)
+            frontier = []
+            for child in level:
+                child_id = str(child['_id'])
+                if child_id in seen:
+                    continue
+                seen.add(child_id)
+                child['children'] = children_by_parent[child_id]
+                children_by_parent[child['parent_id']].append(child)
+                frontier.append(child_id)
+                
+        guide['children'] = children_by_parent[guide_id]
         
         return jsonify({
             'status': 'success',
@@ -541,42 +745,4 @@ async def research_page(guide_id: str):
 
 async def run_guide_research(guide_id: str):
     """Run research for a guide in the background"""
-    try:
-        db = get_database()
-        guide = await db.guides.find_one({"_id": ObjectId(guide_id)})
-        
-        if not guide:
-            logger.error(f"Guide not found: {guide_id}")
-            return
-            
-        # Initialize research service
-        research_service = ResearchService(ResearchConfig.from_config())
-        
-        # Run research
-        research = await research_service.research_topic(guide["topic"], guide_id)
-        
-        # Update guide with research results
-        await db.guides.update_one(
-            {"_id": ObjectId(guide_id)},
-            {
-                "$set": {
-                    "status": "completed",
-                    "research": research.to_dict(),
-                    "metadata.updated": datetime.utcnow()
-                }
-            }
-        )
-        
-    except Exception as e:
-        logger.error(f"Research failed for guide {guide_id}: {str(e)}", exc_info=True)
-        # Update guide with error status
-        await db.guides.update_one(
-            {"_id": ObjectId(guide_id)},
-            {
-                "$set": {
-                    "status": "error",
-                    "error": str(e),
-                    "metadata.updated": datetime.utcnow()
-                }
-            }
-        ) 
\ No newline at end of file
+    await _run_research_into(get_async_database().guides, guide_id, "topic", "metadata.updated")
@@ -0,0 +1,112 @@
+"""
+Research tree node model.
+"""
+from datetime import datetime
+import uuid
+from typing import Optional, List, Dict, Any
+
+def _now() -> datetime:
+    """Timestamp for model bookkeeping; callers touching many objects take it once and pass it down"""
+    return datetime.utcnow()
+
+class Node:
+    """
+    Node in a research tree following the new tree structure.
+    Each node represents a research topic with associated AI research results.
+    """
+    __slots__ = ('topic', 'node_id', 'status', 'research', 'children', 'created_at', 'updated_at')
+    
+    def __init__(
+        self,
+        topic: str,
+        node_id: Optional[str] = None,
+        status: str = "initializing",
+        research: Optional[Dict[str, Any]] = None,
+        children: Optional[List['Node']] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
+    ):
+        self.topic = topic
+        self.node_id = node_id if node_id else uuid.uuid4().hex
+        self.status = status
+        self.research = research or {}
+        self.children = children or []
+        if created_at is None or updated_at is None:
+            now = _now()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert Node to dictionary for MongoDB storage"""
+        return {
+            "node_id": self.node_id,
+            "topic": self.topic,
+            "status": self.status,
+            "research": self.research,
+            "children": [child.to_dict() for child in self.children],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any], now: Optional[datetime] = None) -> 'Node':
+        """Create Node from dictionary; nodes missing timestamps share one `now`"""
+        if not data:
+            return None
+            
+        return Node.from_dicts([data], now)[0]
+    
+    @staticmethod
+    def from_dicts(items: List[Dict[str, Any]], now: Optional[datetime] = None) -> List['Node']:
+        """Create Nodes, subtrees included, from a list of dictionaries in one pass without recursion"""
+        now = now or _now()
+        nodes: List['Node'] = []
+        # Each entry pairs a node dictionary with the list its Node is appended to;
+        # pushing in reverse keeps siblings in their stored order
+        stack = [(data, nodes) for data in reversed(items)]
+        while stack:
+            data, siblings = stack.pop()
+            if not data:
+                siblings.append(None)
+                continue
+                
+            node = Node(
+                topic=data["topic"],
+                node_id=data.get("node_id"),
+                status=data.get("status", "initializing"),
+                research=data.get("research", {}),
+                created_at=data.get("created_at") or now,
+                updated_at=data.get("updated_at") or now
+            )
+            siblings.append(node)
+            stack.extend((child, node.children) for child in reversed(data.get("children", [])))
+            
+        return nodes
+    
+    def add_child(self, child: 'Node', now: Optional[datetime] = None) -> None:
+        """Add a child node"""
+        self.children.append(child)
+        self.updated_at = now or _now()
+    
+    def find_node_by_id(self, node_id: str) -> Optional['Node']:
+        """Find a node by ID in this tree (depth-first, without recursion)"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.node_id == node_id:
+                return node
+            stack.extend(reversed(node.children))
+            
+        return None
+    
+    def build_index(self) -> Dict[str, 'Node']:
+        """Map every node ID in this tree to its node, for callers doing many lookups"""
+        index = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            index[node.node_id] = node
+            stack.extend(node.children)
+        return index
@@ -0,0 +1,95 @@
+"""
+Research topic model.
+"""
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+def _now() -> datetime:
+    """Timestamp for model bookkeeping; callers touching many objects take it once and pass it down"""
+    return datetime.utcnow()
+
+def _default_metadata() -> Dict[str, Any]:
+    """Fresh research bookkeeping for a topic"""
+    return {
+        'last_research_attempt': None,
+        'research_attempts': 0,
+        'error_count': 0,
+        'success_count': 0
+    }
+
+class ResearchTopic:
+    # Fixed attribute set; slots skip the per-instance __dict__
+    __slots__ = (
+        'topic', 'parent_id', 'is_user_added', 'context', 'depth', 'created_at',
+        'updated_at', 'research_results', 'status', 'children', 'metadata'
+    )
+    
+    def __init__(
+        self,
+        topic: str,
+        parent_id: Optional[str] = None,
+        is_user_added: bool = False,
+        context: Optional[Dict[str, Any]] = None,
+        depth: int = 0
+    ):
+        self.topic = topic
+        self.parent_id = parent_id
+        self.is_user_added = is_user_added
+        self.context = context or {}
+        self.depth = depth
+        self.created_at = self.updated_at = _now()
+        self.research_results = None
+        self.status = 'pending'  # pending, in_progress, completed, error
+        self.children: List[str] = []  # List of child topic IDs
+        self.metadata = _default_metadata()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ResearchTopic':
+        topic = ResearchTopic(
+            topic=data['topic'],
+            parent_id=data.get('parent_id'),
+            is_user_added=data.get('is_user_added', False),
+            context=data.get('context'),
+            depth=data.get('depth', 0)
+        )
+        topic.created_at = data.get('created_at', topic.created_at)
+        topic.updated_at = data.get('updated_at', topic.updated_at)
+        topic.research_results = data.get('research_results')
+        topic.status = data.get('status', 'pending')
+        topic.children = data.get('children', [])
+        if 'metadata' in data:
+            topic.metadata = data['metadata']
+        return topic
+
+    def add_child(self, child_id: str, now: Optional[datetime] = None) -> None:
+        """Add a child topic ID"""
+        if child_id not in self.children:
+            self.children.append(child_id)
+            self.updated_at = now or _now()
+
+    def remove_child(self, child_id: str, now: Optional[datetime] = None) -> None:
+        """Remove a child topic ID"""
+        if child_id in self.children:
+            self.children.remove(child_id)
+            self.updated_at = now or _now()
+
+    def update_status(self, status: str, now: Optional[datetime] = None) -> None:
+        """Update the research status"""
+        now = now or _now()
+        self.status = status
+        self.updated_at = now
+        self.metadata['last_research_attempt'] = now
+        self.metadata['research_attempts'] += 1
+
+    def record_error(self, now: Optional[datetime] = None) -> None:
+        """Record a research error"""
+        self.metadata['error_count'] += 1
+        self.updated_at = now or _now()
+
+    def record_success(self, now: Optional[datetime] = None) -> None:
+        """Record a successful research"""
+        self.metadata['success_count'] += 1
+        self.updated_at = now or _now()
@@ -2,9 +2,13 @@
 Tests for research validation logic in the AI Council Guide Creation Website
 Task 1.2: Test enhanced input validation logic
 """
+import asyncio
 import pytest
-import json
-from src.backend.blueprints.research import validate_topic
+import orjson
+from bson import ObjectId
+from quart import Quart
+import src.backend.blueprints.research as research_blueprint
+from src.backend.blueprints.research import validate_topic, research_bp
 
 class TestTopicValidation:
     """Test cases for topic validation"""
@@ -15,6 +19,11 @@ class TestTopicValidation:
         assert validate_topic(None) is not None
         assert validate_topic('   ') is not None
     
+    def test_non_string_topic(self):
+        """Should reject topics that are not strings instead of raising"""
+        for topic in (123, ["a"], {"topic": "How to start a podcast"}, 0, []):
+            assert validate_topic(topic) == "Topic must be a string"
+    
     def test_short_topic(self):
         """Should reject topics with fewer than 3 words"""
         assert validate_topic('Web development') is not None
@@ -57,20 +66,83 @@ def test_api_validation(client):
     # Test invalid topic (too short)
     response = client.post(
         '/api/research/', 
-        data=json.dumps({'topic': 'Too short'}),
+        data=orjson.dumps({'topic': 'Too short'}),
         content_type='application/json'
     )
     assert response.status_code == 400
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert 'error' in data
     
     # Test valid topic
     response = client.post(
         '/api/research/', 
-        data=json.dumps({'topic': 'How to start a podcast'}),
+        data=orjson.dumps({'topic': 'How to start a podcast'}),
         content_type='application/json'
     )
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert 'guide_id' in data
-    assert data['status'] == 'paused_research' 
\ No newline at end of file
+    assert data['status'] == 'paused_research' 
+
+class FakeInsertResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+class FakeTopics:
+    """In-memory stand-in for the async topics collection"""
+    
+    def __init__(self, *topics):
+        self.topics = {topic["_id"]: topic for topic in topics}
+        
+    async def find_one(self, filter, projection=None):
+        return self.topics.get(filter["_id"])
+        
+    async def insert_one(self, doc):
+        doc["_id"] = ObjectId()
+        self.topics[doc["_id"]] = doc
+        return FakeInsertResult(doc["_id"])
+
+class FakeDatabase:
+    def __init__(self, topics):
+        self.topics = topics
+
+@pytest.fixture
+def topics(monkeypatch):
+    """Route the research blueprint's database access to an in-memory topics collection"""
+    topics = FakeTopics()
+    monkeypatch.setattr(research_blueprint, "get_async_database", lambda: FakeDatabase(topics))
+    return topics
+
+def post_topic(body):
+    """POST a topic to a bare app serving only the research blueprint"""
+    app = Quart(__name__)
+    app.register_blueprint(research_bp)
+    
+    async def run():
+        response = await app.test_client().post('/api/topics', json=body)
+        return response.status_code, await response.get_json()
+        
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("parent_id", ["abc", 123, {}, ["a"]])
+def test_add_topic_rejects_malformed_parent_id(topics, parent_id):
+    """A parent_id that is not an ObjectId string should be a 400, not a 500"""
+    status, data = post_topic({'name': 'How to start a podcast', 'parent_id': parent_id})
+    assert status == 400
+    assert data['message'] == 'Invalid parent ID'
+    assert not topics.topics
+
+def test_add_topic_missing_parent_returns_404(topics):
+    """A well-formed parent_id with no matching topic should be a 404"""
+    status, data = post_topic({'name': 'How to start a podcast', 'parent_id': str(ObjectId())})
+    assert status == 404
+    assert data['message'] == 'Parent topic not found'
+    assert not topics.topics
+
+def test_add_topic_sets_depth_below_parent(topics):
+    """A child topic should be stored one level below its parent"""
+    parent_id = ObjectId()
+    topics.topics[parent_id] = {"_id": parent_id, "name": "Podcasting basics", "depth": 1}
+    status, data = post_topic({'name': 'How to start a podcast', 'parent_id': str(parent_id)})
+    assert status == 200
+    assert topics.topics[ObjectId(data['topic_id'])]['depth'] == 2
@@ -1,14 +1,21 @@
 """
 MongoDB connection module for AI Council Guide Creation Website
 """
+import atexit
 import os
 import sys
-from pymongo import MongoClient
-from dotenv import load_dotenv
+from functools import lru_cache
+from pymongo import MongoClient, IndexModel
+from pymongo.uri_parser import parse_uri
+from motor.motor_asyncio import AsyncIOMotorClient
 import logging
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env once per process; deployments that inject
+# the environment directly can set AI_COUNCIL_DOTENV_LOADED to skip the file search
+if not os.environ.get('AI_COUNCIL_DOTENV_LOADED'):
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ['AI_COUNCIL_DOTENV_LOADED'] = '1'
 
 # Try to import from config.py
 try:
@@ -18,32 +25,70 @@ try:
 except (ImportError, AttributeError):
     MONGODB_URI = None
 
+# Resolve where the URI came from once at import rather than re-probing config on every call
+MONGODB_URI_SOURCE = 'config.py' if MONGODB_URI else 'environment variables'
+
 # Fall back to environment variables if not found in config
 if not MONGODB_URI:
     MONGODB_URI = os.environ.get('MONGO_URI') or os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/ai_council')
 
+# Database used when the connection string does not name one
+DEFAULT_DATABASE_NAME = 'ai_council'
+
+# Connection pool bounds for the shared clients
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+
 logger = logging.getLogger(__name__)
 
-def get_database():
+# Databases whose collections and indexes this process has already initialized
+_initialized_databases = set()
+
+@lru_cache(maxsize=None)
+def get_database_name(uri):
+    """Extract the database name from a MongoDB connection string, defaulting to ai_council"""
+    return parse_uri(uri).get('database') or DEFAULT_DATABASE_NAME
+
+@lru_cache(maxsize=None)
+def get_async_client(uri=MONGODB_URI):
     """
-    Create a MongoDB connection and return the database object
+    Return the process-wide Motor client for a connection string.
+    The client is created on first use and shared so every service draws
+    from one connection pool.
     Returns:
-        pymongo.database.Database: MongoDB database object
+        motor.motor_asyncio.AsyncIOMotorClient: Shared async MongoDB client
     """
-    logger.debug(f"Connecting to MongoDB at: {MONGODB_URI}")
-    logger.debug(f"Connection source: {'config.py' if MONGODB_URI == getattr(config, 'MONGO_URI', None) else 'environment variables'}")
-    
-    # Create a MongoDB client
-    client = MongoClient(MONGODB_URI)
-    logger.debug(f"MongoDB client created with address: {client.address}")
-    
-    # Extract database name from URI
-    db_name = MONGODB_URI.split('/')[-1]
-    if '?' in db_name:
-        db_name = db_name.split('?')[0]
-    
-    logger.debug(f"Using database: {db_name}")
-    db = client[db_name]
+    logger.debug(f"Creating shared async MongoDB client (pool {MONGO_MIN_POOL_SIZE}-{MONGO_MAX_POOL_SIZE})")
+    return AsyncIOMotorClient(
+        uri,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE
+    )
+
+def get_async_database(uri=MONGODB_URI):
+    """
+    Return the async database object backed by the shared Motor client
+    Returns:
+        motor.motor_asyncio.AsyncIOMotorDatabase: Async MongoDB database object
+    """
+    return get_async_client(uri)[get_database_name(uri)]
+
+@lru_cache(maxsize=None)
+def get_client(uri=MONGODB_URI):
+    """
+    Return the process-wide PyMongo client for a connection string.
+    The connection is verified once, when the client is first created; later
+    callers share the client and its connection pool.
+    Returns:
+        pymongo.MongoClient: Shared MongoDB client
+    """
+    logger.debug(f"Connecting to MongoDB at: {uri}")
+    logger.debug(f"Connection source: {MONGODB_URI_SOURCE}")
+    client = MongoClient(
+        uri,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE
+    )
     
     # Verify connection
     try:
@@ -52,50 +97,55 @@ def get_database():
         logger.debug("Successfully connected to MongoDB")
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {str(e)}", exc_info=True)
+        client.close()
         raise
         
-    return db
+    atexit.register(client.close)
+    return client
+
+def get_database():
+    """
+    Return the database object backed by the shared MongoDB client
+    Returns:
+        pymongo.database.Database: MongoDB database object
+    """
+    return get_client()[get_database_name(MONGODB_URI)]
 
 def initialize_collections():
     """
-    Initialize MongoDB collections with indexes and schema validation if needed
+    Initialize MongoDB collections with indexes and schema validation if needed.
+    Runs once per database per process; later calls return the database untouched.
     """
-    logger.debug("Initializing MongoDB collections")
     db = get_database()
+    if db.name in _initialized_databases:
+        return db
+        
+    logger.debug("Initializing MongoDB collections")
     
-    # Create indexes for better performance
-    # Guides collection
-    if 'guides' not in db.list_collection_names():
-        logger.debug("Creating guides collection")
-        db.create_collection('guides')
+    # create_indexes creates a missing collection and is a no-op for existing
+    # indexes, so each collection needs a single command and no existence check
     logger.debug("Creating indexes for guides collection")
-    db.guides.create_index([('topic', 1)])
-    db.guides.create_index([('status', 1)])
+    db.guides.create_indexes([
+        IndexModel([('topic', 1)]),
+        IndexModel([('status', 1)])
+    ])
     
-    # Users collection
-    if 'users' not in db.list_collection_names():
-        logger.debug("Creating users collection")
-        db.create_collection('users')
     logger.debug("Creating indexes for users collection")
-    db.users.create_index([('email', 1)], unique=True)
+    db.users.create_indexes([IndexModel([('email', 1)], unique=True)])
     
-    # Word lists collection
-    if 'word_lists' not in db.list_collection_names():
-        logger.debug("Creating word_lists collection")
-        db.create_collection('word_lists')
     logger.debug("Creating indexes for word_lists collection")
-    db.word_lists.create_index([('user_id', 1)])
+    db.word_lists.create_indexes([IndexModel([('user_id', 1)])])
     
-    # Research collection for shared research data
-    if 'research' not in db.list_collection_names():
-        logger.debug("Creating research collection")
-        db.create_collection('research')
+    # Research collection for shared research data: lookups filter by topic and
+    # either sort newest first or check whether recursive research has finished
     logger.debug("Creating indexes for research collection")
-    db.research.create_index([('topic', 1)])
-    db.research.create_index([('timestamp', -1)])
-    db.research.create_index([('recursive_research_completed', 1)])
+    db.research.create_indexes([
+        IndexModel([('topic', 1), ('timestamp', -1)], name='topic_ts'),
+        IndexModel([('topic', 1), ('recursive_research_completed', 1)], name='topic_recur')
+    ])
     
-    collections = db.list_collection_names()
-    logger.debug(f"MongoDB collections initialized: {', '.join(collections)}")
+    _initialized_databases.add(db.name)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"MongoDB collections initialized: {', '.join(db.list_collection_names())}")
     
-    return db 
\ No newline at end of file
+    return db
@@ -1,11 +1,14 @@
 """
 AI Council implementation using LangChain for orchestration.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Callable, Awaitable
 from datetime import datetime
 import asyncio
 import logging
-import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from langchain.prompts import PromptTemplate
 from langchain_core.runnables import RunnableSequence
 from langchain_core.output_parsers import JsonOutputParser
@@ -15,10 +18,87 @@ from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.utilities import GoogleSearchAPIWrapper
 from .research_base import ResearchConfig, ResearchError
+from .research_cache import ResearchCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Google search is a blocking HTTP call; a small dedicated pool bounds how many run
+# at once without competing with other users of the loop's default executor
+_SEARCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SEARCH_WORKERS", "4")),
+    thread_name_prefix="google-search"
+)
+
+# Recent search results by normalized topic, shared across research sessions
+_SEARCH_CACHE = ResearchCache(
+    maxsize=int(os.environ.get("SEARCH_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("SEARCH_CACHE_TTL", "300"))
+)
+
+# Research fields a failed member reports, all empty
+_EMPTY_RESEARCH_FIELDS = ("key_points", "entities", "timeline", "further_research", "references")
+
+def _empty_research() -> Dict[str, Any]:
+    """Research payload for a member whose research failed; fresh each time since trees are stored and edited"""
+    research = {"summary": ""}
+    research.update((field, []) for field in _EMPTY_RESEARCH_FIELDS)
+    return research
+
+# Shared by every council member's chain; parsed once at import
+_RESEARCH_PROMPT = PromptTemplate(
+    input_variables=["topic", "web_results"],
+    template="""Analyze the following topic using the provided search results:
+
+Topic: {topic}
+
+Web Search Results:
+{web_results}
+
+Provide a comprehensive analysis in the following JSON format:
+{{
+    "summary": "detailed summary",
+    "key_points": ["point 1", "point 2", ...],
+    "entities": [{{"name": "entity name", "type": "entity type", "description": "..."}}],
+    "timeline": [{{"date": "YYYY-MM-DD", "event": "description"}}],
+    "further_research": [{{"topic": "subtopic", "reason": "why this needs research"}}],
+    "references": [{{"title": "source title", "url": "source url"}}]
+}}
+
+Ensure your response is ONLY the JSON object, with no additional text."""
+)
+
+# One search result line: the title before the first " - " and the URL up to the next one
+_SEARCH_LINE_RE = re.compile(r"^(.*?) - (.*?)(?= - |$)", re.MULTILINE)
+
+def parse_web_results(web_results: str) -> List[Dict[str, str]]:
+    """Title and URL of each "title - url" line in Google search output; other lines are skipped"""
+    return [
+        {"title": match.group(1).strip(), "url": match.group(2).strip()}
+        for match in _SEARCH_LINE_RE.finditer(web_results)
+    ]
+
+@lru_cache(maxsize=None)
+def _get_google_search(api_key: str, cse_id: str) -> GoogleSearchAPIWrapper:
+    """Google Search wrapper for a set of credentials, built once and shared"""
+    return GoogleSearchAPIWrapper(google_api_key=api_key, google_cse_id=cse_id)
+
+async def run_google_search(config: ResearchConfig, topic: str) -> str:
+    """Run a Google search for a topic on the dedicated search pool, reusing recent and in-flight searches"""
+    async def search() -> str:
+        google_search = _get_google_search(
+            config.google_search_api_key,
+            config.google_search_engine_id
+        )
+        logger.debug("Running Google search")
+        return await asyncio.get_running_loop().run_in_executor(
+            _SEARCH_EXECUTOR,
+            google_search.run,
+            topic
+        )
+        
+    return await _SEARCH_CACHE.get_or_compute(topic, search)
+
 class ResearchOutput(BaseModel):
     """Structure for research output"""
     summary: str = Field(description="Detailed summary of the research")
@@ -73,34 +153,11 @@ class AICouncilMember:
             else:
                 raise ValueError(f"Unknown AI member: {self.name}")
 
-            # Create the prompt template
-            prompt = PromptTemplate(
-                input_variables=["topic", "web_results"],
-                template="""Analyze the following topic using the provided search results:
-
-Topic: {topic}
-
-Web Search Results:
-{web_results}
-
-Provide a comprehensive analysis in the following JSON format:
-{{
-    "summary": "detailed summary",
-    "key_points": ["point 1", "point 2", ...],
-    "entities": [{{"name": "entity name", "type": "entity type", "description": "..."}}],
-    "timeline": [{{"date": "YYYY-MM-DD", "event": "description"}}],
-    "further_research": [{{"topic": "subtopic", "reason": "why this needs research"}}],
-    "references": [{{"title": "source title", "url": "source url"}}]
-}}
-
-Ensure your response is ONLY the JSON object, with no additional text."""
-            )
-
             # Create the output parser
             output_parser = JsonOutputParser(pydantic_object=ResearchOutput)
 
             # Create the chain
-            chain = prompt | llm | output_parser
+            chain = _RESEARCH_PROMPT | llm | output_parser
 
             logger.debug(f"Chain created successfully for {self.name}")
             return chain
@@ -109,23 +166,13 @@ Ensure your response is ONLY the JSON object, with no additional text."""
             logger.error(f"Failed to create chain for {self.name}: {str(e)}", exc_info=True)
             raise ResearchError(f"Failed to create chain for {self.name}: {str(e)}")
             
-    async def research(self, topic: str) -> Dict[str, Any]:
-        """Conduct research using LangChain"""
+    async def research(self, topic: str, web_results: Optional[str] = None) -> Dict[str, Any]:
+        """Conduct research using LangChain, searching Google unless results are passed in"""
         try:
             logger.debug(f"{self.name} starting research for topic: {topic}")
             
-            # Initialize Google Search
-            google_search = GoogleSearchAPIWrapper(
-                google_api_key=self.config.google_search_api_key,
-                google_cse_id=self.config.google_search_engine_id
-            )
-            
-            # Perform Google search
-            logger.debug("Running Google search")
-            web_results = await asyncio.to_thread(
-                google_search.run,
-                topic
-            )
+            if web_results is None:
+                web_results = await run_google_search(self.config, topic)
             
             # Run the research chain
             logger.debug(f"Running {self.name} research chain")
@@ -136,11 +183,7 @@ Ensure your response is ONLY the JSON object, with no additional text."""
             
             # Add web results to the response
             result_dict = result  # Result is already a dict from JsonOutputParser
-            result_dict["web_results"] = [
-                {"title": r.split(" - ")[0].strip(), "url": r.split(" - ")[1].strip()}
-                for r in web_results.split("\n")
-                if " - " in r
-            ]
+            result_dict["web_results"] = parse_web_results(web_results)
             
             return {
                 "ai_name": self.name,
@@ -162,71 +205,108 @@ class AICouncil:
             "gemini": {"enabled": False, "config": config},
             "grok": {"enabled": True, "config": config}  # Only Grok is enabled by default
         }
+        # Members (and their LLM clients) are built on first use and reused across calls
+        self._member_instances: Dict[str, AICouncilMember] = {}
+        
+    def _get_member(self, member_name: str) -> AICouncilMember:
+        """Return the council member instance for a name, building it on first use"""
+        member = self._member_instances.get(member_name)
+        if member is None:
+            member = AICouncilMember(member_name, self.members[member_name]["config"])
+            self._member_instances[member_name] = member
+        return member
+        
+    async def _research_member(self, member_name: str, topic: str, web_results: str):
+        """Research a topic with one member, returning the member name with its result or exception"""
+        try:
+            return member_name, await self._get_member(member_name).research(topic, web_results)
+        except Exception as e:
+            return member_name, e
+            
+    def _member_tree(self, member_name: str, result: Any, topic: str, session_id: Optional[str]) -> Dict[str, Any]:
+        """Build the tree entry for one member's research result"""
+        if isinstance(result, Exception):
+            logger.error(f"[DEBUG AICouncil] {member_name} research failed: {str(result)}")
+            research = _empty_research()
+        else:
+            logger.debug(f"[DEBUG AICouncil] {member_name} research succeeded")
+            # Log some stats about the result
+            if isinstance(result, dict) and "result" in result:
+                further_research_count = len(result["result"].get("further_research", []))
+                logger.debug(f"[DEBUG AICouncil] {member_name} found {further_research_count} further research topics")
+                
+                if further_research_count > 0:
+                    topics = [item.get("topic", "Unknown") for item in result["result"].get("further_research", [])]
+                    logger.debug(f"[DEBUG AICouncil] Further research topics: {topics}")
+            research = result["result"]
+            
+        return {
+            "node_id": session_id,  # Important to include node_id for tree structure
+            "topic": topic,
+            "status": "completed",
+            "research": research,
+            "children": []  # Important to include children array
+        }
         
-    async def conduct_research(self, topic: str, session_id: Optional[str] = None, parent_id: Optional[str] = None) -> Dict[str, Any]:
-        """Conduct research with all enabled members"""
+    async def conduct_research(self, topic: str, session_id: Optional[str] = None, parent_id: Optional[str] = None, enabled: Optional[Set[str]] = None,
+                               on_partial: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """Conduct research with all enabled members, or only the members named in `enabled` for this call.
+        
+        If `on_partial` is given it is awaited with each member's name and tree as soon as that member finishes.
+        """
         logger.debug(f"[DEBUG AICouncil] Starting conduct_research for topic: {topic}")
         logger.debug(f"[DEBUG AICouncil] Session ID: {session_id}, Parent ID: {parent_id}")
         
-        tasks = []
         enabled_members = []
         
-        # Add tasks for all enabled members
+        # Collect all enabled members
         for member_name, member_config in self.members.items():
-            if member_config["enabled"]:
+            is_enabled = member_name in enabled if enabled is not None else member_config["enabled"]
+            if is_enabled:
                 logger.debug(f"[DEBUG AICouncil] Adding research task for enabled member: {member_name}")
                 enabled_members.append(member_name)
-                member = AICouncilMember(member_name, member_config["config"])
-                tasks.append(member.research(topic))
             else:
                 logger.debug(f"[DEBUG AICouncil] Member {member_name} is disabled, skipping")
-                    
-        # Run all research in parallel
-        logger.debug(f"[DEBUG AICouncil] Starting parallel research with {len(tasks)} tasks")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        logger.debug(f"[DEBUG AICouncil] Gathered {len(results)} results")
-        
-        # Process results and create trees structure
-        trees = {}
-        
-        for i, member_name in enumerate(enabled_members):
-            result = results[i]
-            logger.debug(f"[DEBUG AICouncil] Processing result for {member_name}")
-            
-            if isinstance(result, Exception):
-                logger.error(f"[DEBUG AICouncil] {member_name} research failed: {str(result)}")
-                trees[member_name] = {
-                    "node_id": session_id,  # Important to include node_id for tree structure
-                    "topic": topic,
-                    "status": "completed",
-                    "research": {
-                        "summary": "",
-                        "key_points": [],
-                        "entities": [],
-                        "timeline": [],
-                        "further_research": [],
-                        "references": []
-                    },
-                    "children": []  # Important to include children array
-                }
-            else:
-                logger.debug(f"[DEBUG AICouncil] {member_name} research succeeded")
-                # Log some stats about the result
-                if isinstance(result, dict) and "result" in result:
-                    further_research_count = len(result["result"].get("further_research", []))
-                    logger.debug(f"[DEBUG AICouncil] {member_name} found {further_research_count} further research topics")
-                    
-                    if further_research_count > 0:
-                        topics = [item.get("topic", "Unknown") for item in result["result"].get("further_research", [])]
-                        logger.debug(f"[DEBUG AICouncil] Further research topics: {topics}")
                 
-                trees[member_name] = {
-                    "node_id": session_id,  # Important to include node_id for tree structure
-                    "topic": topic,
-                    "status": "completed",
-                    "research": result["result"],
-                    "children": []  # Important to include children array
-                }
+        # Every member analyses the same topic, so search once and share the results;
+        # a failed search fails each member just as its own search would have
+        finished = {}
+        if enabled_members:
+            try:
+                web_results = await run_google_search(self.config, topic)
+            except Exception as e:
+                logger.error(f"[DEBUG AICouncil] Google search failed: {str(e)}", exc_info=True)
+                error = ResearchError(f"Google search failed: {str(e)}")
+                for member_name in enabled_members:
+                    finished[member_name] = self._member_tree(member_name, error, topic, session_id)
+                    if on_partial is not None:
+                        await on_partial(member_name, finished[member_name])
+            else:
+                # Run all research in parallel, handing each tree on as soon as its member finishes
+                logger.debug(f"[DEBUG AICouncil] Starting parallel research with {len(enabled_members)} tasks")
+                tasks = [
+                    asyncio.create_task(self._research_member(member_name, topic, web_results))
+                    for member_name in enabled_members
+                ]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        member_name, result = await next_done
+                        logger.debug(f"[DEBUG AICouncil] Processing result for {member_name}")
+                        finished[member_name] = self._member_tree(member_name, result, topic, session_id)
+                        if on_partial is not None:
+                            await on_partial(member_name, finished[member_name])
+                finally:
+                    # If this call is cancelled (or on_partial raises), stop the members still
+                    # running rather than leaving their LLM calls to finish unobserved
+                    unfinished = [task for task in tasks if not task.done()]
+                    for task in unfinished:
+                        task.cancel()
+                    if unfinished:
+                        await asyncio.gather(*unfinished, return_exceptions=True)
+        logger.debug(f"[DEBUG AICouncil] Gathered {len(finished)} results")
+        
+        # Keep the trees in council order regardless of which member finished first
+        trees = {member_name: finished[member_name] for member_name in enabled_members}
             
         logger.debug(f"[DEBUG AICouncil] Created trees structure with {len(trees)} AIs")
                     
@@ -251,4 +331,11 @@ class AICouncil:
         """Disable a council member"""
         if member_name not in self.members:
             raise ResearchError(f"Unknown member: {member_name}")
-        self.members[member_name]["enabled"] = False 
\ No newline at end of file
+        self.members[member_name]["enabled"] = False
+
+@lru_cache(maxsize=None)
+def get_council() -> AICouncil:
+    """Return the process-wide council built from config.py, with Grok enabled"""
+    council = AICouncil(ResearchConfig.from_config())
+    council.enable_member("grok")
+    return council
@@ -6,6 +6,12 @@ from datetime import datetime
 from dataclasses import dataclass, asdict
 from bson import ObjectId
 
+# Research chain output keys that map one-to-one onto ResearchNode fields
+_CHAIN_OUTPUT_FIELDS = (
+    "summary", "key_points", "entities", "subtopics", "timeline",
+    "further_research", "references", "web_results", "ai_responses", "token_usage"
+)
+
 @dataclass
 class ResearchNode:
     """A node in the research tree"""
@@ -68,6 +74,12 @@ class ResearchNode:
             data['_id'] = str(data['_id'])
         return cls(**data)
         
+    @classmethod
+    def from_chain_output(cls, results: Dict[str, Any], status: str = "completed") -> 'ResearchNode':
+        """Create from research chain output, leaving missing fields at their defaults"""
+        fields = {key: results[key] for key in _CHAIN_OUTPUT_FIELDS if key in results}
+        return cls(topic=results["topic"], status=status, **fields)
+        
 @dataclass
 class AIResponse:
     """Response from an AI in the council"""
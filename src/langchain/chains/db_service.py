@@ -44,20 +44,7 @@ class DatabaseService:
     def store_research_results(self, session_id: str, results: Dict[str, Any]) -> bool:
         """Store research results in a session"""
         # Create a research node for the results
-        node = ResearchNode(
-            topic=results["topic"],
-            status="completed",
-            summary=results.get("summary", ""),
-            key_points=results.get("key_points", []),
-            entities=results.get("entities", []),
-            subtopics=results.get("subtopics", []),
-            timeline=results.get("timeline", []),
-            further_research=results.get("further_research", []),
-            references=results.get("references", []),
-            web_results=results.get("web_results", []),
-            ai_responses=results.get("ai_responses", []),
-            token_usage=results.get("token_usage", {})
-        )
+        node = ResearchNode.from_chain_output(results)
         
         # Store the node
         node_id = self.create_research_node(node)
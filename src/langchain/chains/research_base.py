@@ -1,16 +1,22 @@
 """
 Base classes and interfaces for the research system.
 """
+import asyncio
 import os
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Protocol
 from dataclasses import dataclass
+from functools import lru_cache
 from config import (
     OPENAI_KEY, XAI_API_KEY, GEMINI_API_KEY,
     GOOGLE_SEARCH_API_KEY, GOOGLE_SEARCH_ENGINE_ID,
     MONGO_URI, OPENAI_API_BASE
 )
 
+# Caps concurrent council research across every route in the process (app and
+# blueprint alike) so bursts stay under the upstream LLM rate limits
+research_slots = asyncio.Semaphore(int(os.environ.get("RESEARCH_CONCURRENCY", "4")))
+
 # Custom Exceptions
 class ResearchError(Exception): 
     """Base exception for research-related errors"""
@@ -45,8 +51,9 @@ class ResearchConfig:
     retry_delay: int = 2  # Base delay between retries in seconds
     
     @classmethod
+    @lru_cache(maxsize=1)
     def from_config(cls) -> 'ResearchConfig':
-        """Create config from config.py values"""
+        """Create config from config.py values; built once and shared (reset with from_config.cache_clear())"""
         return cls(
             openai_api_key=OPENAI_KEY,
             anthropic_api_key="",  # Add if needed
@@ -114,7 +121,7 @@ class SearchService(Protocol):
 
 class DatabaseService(Protocol):
     """Interface for database services"""
-    async def get_guide(self, guide_id: str) -> Optional[Dict[str, Any]]: ...
+    async def get_guide(self, guide_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]: ...
     async def get_research_results(self, guide_id: str) -> Optional[Dict[str, Any]]: ...
     async def store_research(self, research: Dict[str, Any], guide_id: Optional[str] = None) -> str: ...
     async def get_cached_research(self, topic: str) -> Optional[Dict[str, Any]]: ...
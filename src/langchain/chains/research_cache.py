@@ -0,0 +1,98 @@
+"""
+In-process cache of research results keyed by normalized topic.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+class ResearchCache:
+    """Small LRU cache with a time-to-live for research_topic results (or any per-topic value)"""
+    def __init__(self, maxsize: int = 256, ttl: float = 14400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self.hits = 0
+        self.misses = 0
+        # Requests that joined a computation already in flight
+        self.coalesced = 0
+
+    @staticmethod
+    def key(topic: str) -> str:
+        """Cache key for a topic, ignoring case and whitespace differences"""
+        normalized = " ".join(topic.split()).lower()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, topic: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a topic, or None if missing or expired"""
+        key = self.key(topic)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, topic: str, value: Dict[str, Any]):
+        """Cache a result for a topic, evicting the least recently used entry when full"""
+        key = self.key(topic)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, topic: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Return the cached result for a topic, computing it once even when requested concurrently"""
+        value = self.get(topic)
+        if value is not None:
+            self.hits += 1
+            return value
+            
+        key = self.key(topic)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # Another caller is already researching this topic; share its result
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+            
+        self.misses += 1
+        task = asyncio.ensure_future(compute())
+        self._inflight[key] = task
+        
+        def finished(done: "asyncio.Future[Dict[str, Any]]"):
+            # Runs even if the caller that started the computation was cancelled
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            if not done.cancelled() and done.exception() is None:
+                self.set(topic, done.result())
+                
+        task.add_done_callback(finished)
+        # Shielded so a cancelled caller does not cancel the computation others have joined
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and coalesced request counts with the current number of entries"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight)
+        }
+
+    def clear(self):
+        """Drop every cached result and forget computations in flight"""
+        self._entries.clear()
+        self._inflight.clear()
+
+# Process-wide cache shared by the research entry points
+research_cache = ResearchCache(
+    maxsize=int(os.environ.get("RESEARCH_CACHE_SIZE", "256")),
+    ttl=float(os.environ.get("RESEARCH_CACHE_TTL", "14400"))
+)
@@ -1,25 +1,46 @@
 """
 Service implementations for the research system.
 """
-import json
+import re
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import orjson
+from typing import Dict, List, Any, Optional, Set
+from datetime import datetime, timezone
 import aiohttp
-from motor.motor_asyncio import AsyncIOMotorClient
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+from pymongo.write_concern import WriteConcern
 from langchain.callbacks.base import AsyncCallbackHandler
 from .research_base import (
     SearchService, DatabaseService, LoggingService,
     ResearchResult, ResearchConfig, SearchError, DatabaseError
 )
 from .ai_council import AICouncil
-from src.database.mongodb import get_database
-from src.backend.models.research import Node
+from src.database.mongodb import get_async_client, get_database_name
+from src.backend.models.node import Node
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# A placeholder guide is cheap to recreate, so it skips the journal commit wait
+_STUB_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Databases whose indexes this process has already ensured
+_indexed_databases: Set[str] = set()
+
+# Body of a ```json (or bare ```) fenced block; an unclosed fence runs to the end
+_CODE_FENCE_RE = re.compile(r"```(?:json)?(.*?)(?:```|$)", re.DOTALL)
+
+_GROK_REQUIRED_FIELDS = (
+    "summary", "key_points", "entities", "subtopics",
+    "timeline", "further_research", "references"
+)
+
+def _dump_json(obj: Any, indent: bool = False) -> str:
+    """Serialize a document for debug logging with orjson"""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, default=str, option=option).decode()
+
 class ResearchCallbackHandler(AsyncCallbackHandler):
     """Custom callback handler for research tasks"""
     def __init__(self, logging_service: LoggingService):
@@ -54,7 +75,7 @@ class ResearchService:
         """Conduct research and store results"""
         try:
             # Run research using council
-            logger.debug(f"Starting research for topic: {topic}")
+            logger.debug("Starting research for topic: %s", topic)
             research_results = await self.council.conduct_research(topic)
             
             # Create root nodes for each enabled AI
@@ -68,12 +89,13 @@ class ResearchService:
                 ).to_dict()
             
             # Create guide document with trees
+            now = datetime.now(timezone.utc)
             guide_doc = {
                 "topic": topic,
                 "status": "completed",
                 "metadata": {
-                    "created": datetime.utcnow(),
-                    "updated": datetime.utcnow(),
+                    "created": now,
+                    "updated": now,
                     "ais": [name for name, config in self.council.members.items() if config["enabled"]],
                     "depth": await self._get_topic_depth(guide_id)
                 },
@@ -99,7 +121,7 @@ class ResearchService:
             }
             
         except Exception as e:
-            logger.error(f"Research failed: {str(e)}")
+            logger.error("Research failed: %s", e)
             await self.logging_service.log_interaction(
                 'research',
                 'error',
@@ -112,17 +134,14 @@ class ResearchService:
     async def research_subtopic(self, topic: str, ai: str, guide_id: str, parent_node_id: str) -> Dict[str, Any]:
         """Conduct research for a subtopic with a specific AI"""
         try:
-            # Enable only the specified AI
-            for member_name in self.council.members:
-                self.council.members[member_name]["enabled"] = (member_name == ai)
-            
             # Run research with just this AI
-            logger.debug(f"Starting subtopic research for topic: {topic} with AI: {ai}")
-            research_results = await self.council.conduct_research(topic)
+            logger.debug("Starting subtopic research for topic: %s with AI: %s", topic, ai)
+            research_results = await self.council.conduct_research(topic, enabled={ai})
             
             # Get the result for this AI
             ai_result = research_results["research_results"].get(ai, {})
-            logger.debug(f"Got research result for AI {ai}: {json.dumps(ai_result, default=str)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Got research result for AI %s: %s", ai, _dump_json(ai_result))
             
             # Create a node for this research
             new_node = Node(
@@ -134,7 +153,7 @@ class ResearchService:
             return new_node.to_dict()
             
         except Exception as e:
-            logger.error(f"Subtopic research failed: {str(e)}")
+            logger.error("Subtopic research failed: %s", e)
             await self.logging_service.log_interaction(
                 'research',
                 'error',
@@ -150,13 +169,13 @@ class ResearchService:
             return 0
             
         try:
-            guide = await self.db_service.get_guide(parent_id)
+            guide = await self.db_service.get_guide(parent_id, projection={"metadata.depth": 1})
             if not guide:
                 return 0
                 
             return guide.get("metadata", {}).get("depth", 0) + 1
         except Exception as e:
-            logger.error(f"Failed to get topic depth: {str(e)}")
+            logger.error("Failed to get topic depth: %s", e)
             return 0
 
 class GoogleSearchService(SearchService):
@@ -199,9 +218,9 @@ class GoogleSearchService(SearchService):
 
 class MongoDBService(DatabaseService):
     """MongoDB implementation for research storage"""
-    def __init__(self, config: ResearchConfig):
-        # Create async MongoDB client
-        self.client = None
+    def __init__(self, config: ResearchConfig, client: Optional[Any] = None):
+        # Async MongoDB client; defaults to the shared process-wide client on first use
+        self.client = client
         self.db = None
         self.research_collection = None
         self.guide_collection = None
@@ -210,120 +229,154 @@ class MongoDBService(DatabaseService):
         
     async def initialize(self):
         """Initialize MongoDB connection"""
-        if self.client is None:
+        if self.db is None:
             logger.debug("Initializing MongoDB connection")
-            self.client = AsyncIOMotorClient(self.config.mongo_connection)
+            if self.client is None:
+                self.client = get_async_client(self.config.mongo_connection)
             # Get database name from connection string
-            db_name = self.config.mongo_connection.split('/')[-1].split('?')[0]
-            self.db = self.client[db_name]
+            self.db = self.client[get_database_name(self.config.mongo_connection)]
             self.research_collection = self.db.research
             self.guide_collection = self.db.guides
+            await self._ensure_indexes()
             logger.debug("MongoDB connection initialized")
             
-    async def get_guide(self, guide_id: str) -> Optional[Dict[str, Any]]:
-        """Get a guide by ID"""
+    async def _ensure_indexes(self):
+        """Create the indexes the guide queries rely on, once per database per process"""
+        if self.db.name in _indexed_databases:
+            return
+        try:
+            # Text index backs the topic lookup in get_cached_research
+            await self.guide_collection.create_index([("topic", "text")])
+            await self.guide_collection.create_index([("status", 1)])
+            _indexed_databases.add(self.db.name)
+            logger.debug("Indexes ensured for database: %s", self.db.name)
+        except Exception as e:
+            # Queries still work without the indexes, just more slowly
+            logger.warning("Failed to ensure guide indexes: %s", e)
+            
+    async def get_guide(self, guide_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Get a guide by ID, optionally limited to the fields in `projection`"""
         try:
             await self.initialize()
-            logger.debug(f"Looking up guide in database: {guide_id}")
-            guide = await self.guide_collection.find_one({"_id": ObjectId(guide_id)})
-            logger.debug(f"Guide lookup result: {guide}")
+            logger.debug("Looking up guide in database: %s", guide_id)
+            guide = await self.guide_collection.find_one({"_id": ObjectId(guide_id)}, projection=projection)
+            logger.debug("Guide lookup result: %s", guide)
             return guide
         except Exception as e:
-            logger.error(f"Failed to get guide: {str(e)}", exc_info=True)
+            logger.error("Failed to get guide: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get guide: {str(e)}")
             
     async def get_research_results(self, guide_id: str) -> Optional[Dict[str, Any]]:
         """Get research results for a guide"""
         try:
             await self.initialize()
-            logger.debug(f"Getting research results for guide: {guide_id}")
-            guide = await self.get_guide(guide_id)
+            logger.debug("Getting research results for guide: %s", guide_id)
+            # Fetch only the fields the response uses; guides also carry metadata and logs
+            guide = await self.guide_collection.find_one(
+                {"_id": ObjectId(guide_id)},
+                projection={"_id": 0, "topic": 1, "status": 1, "trees": 1, "status_message": 1}
+            )
             if not guide:
-                logger.error(f"Guide not found: {guide_id}")
+                logger.error("Guide not found: %s", guide_id)
                 return None
                 
             # Return the guide with trees structure
-            return {
+            results = {
+                "topic": guide.get("topic"),
                 "status": guide.get("status", "completed"),
                 "trees": guide.get("trees", {})
             }
+            if "status_message" in guide:
+                results["status_message"] = guide["status_message"]
+            return results
         except Exception as e:
-            logger.error(f"Failed to get research results: {str(e)}", exc_info=True)
+            logger.error("Failed to get research results: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get research results: {str(e)}")
             
     async def store_research(self, research: Dict[str, Any], guide_id: Optional[str] = None) -> str:
         """Store research results"""
         try:
             await self.initialize()
-            logger.debug(f"Storing research for guide_id: {guide_id}")
-            logger.debug(f"Research data: {json.dumps(research, default=str)}")
+            logger.debug("Storing research for guide_id: %s", guide_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Research data: %s", _dump_json(research))
             
             # Create a clean guide document
+            now = datetime.now(timezone.utc)
             guide_doc = {
                 "topic": research["topic"],
                 "status": research.get("status", "completed"),
-                "metadata": research.get("metadata", {
-                    "created": datetime.utcnow(),
-                    "updated": datetime.utcnow()
-                }),
-                "updated_at": datetime.utcnow()
+                "metadata": research.get("metadata") or {
+                    "created": now,
+                    "updated": now
+                },
+                "updated_at": now
             }
             
+            if "status_message" in research:
+                guide_doc["status_message"] = research["status_message"]
+            
             # Include trees directly
             if "trees" in research:
                 guide_doc["trees"] = research["trees"]
-                logger.debug(f"Included trees structure: {json.dumps(guide_doc['trees'], default=str)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Included trees structure: %s", _dump_json(guide_doc['trees']))
             
-            logger.debug(f"Created guide document: {json.dumps(guide_doc, default=str)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Created guide document: %s", _dump_json(guide_doc))
             
             # Use upsert for guide_id to ensure atomic updates
             if guide_id:
-                logger.debug(f"Updating existing guide: {guide_id}")
+                logger.debug("Updating existing guide: %s", guide_id)
                 result = await self.guide_collection.update_one(
                     {'_id': ObjectId(guide_id)},
-                    {'$set': guide_doc},
+                    {'$set': guide_doc, '$setOnInsert': {'created_at': now}},
                     upsert=True
                 )
-                logger.debug(f"Guide update result: {result.modified_count} documents modified")
-                logger.debug(f"Upserted ID: {result.upserted_id}")
+                logger.debug("Guide update result: %s documents modified", result.modified_count)
+                logger.debug("Upserted ID: %s", result.upserted_id)
                 return guide_id
             else:
                 logger.debug("Creating new guide document")
-                guide_doc["created_at"] = datetime.utcnow()
+                guide_doc["created_at"] = now
                 result = await self.guide_collection.insert_one(guide_doc)
-                logger.debug(f"New guide created with ID: {result.inserted_id}")
+                logger.debug("New guide created with ID: %s", result.inserted_id)
                 return str(result.inserted_id)
                 
         except Exception as e:
-            logger.error(f"Failed to store research: {str(e)}", exc_info=True)
-            logger.error(f"Research data that failed: {json.dumps(research, default=str)}")
+            logger.error("Failed to store research: %s", e, exc_info=True)
+            logger.error("Research data that failed: %s", _dump_json(research))
             raise DatabaseError(f"Failed to store research: {str(e)}")
             
+    async def create_guide_stub(self, guide_id: str, topic: str, status: str = "running"):
+        """Insert a placeholder guide that store_research later fills in with its results"""
+        try:
+            await self.initialize()
+            now = datetime.now(timezone.utc)
+            stub_guides = self.guide_collection.with_options(write_concern=_STUB_WRITE_CONCERN)
+            await stub_guides.insert_one({
+                '_id': ObjectId(guide_id),
+                'topic': topic,
+                'status': status,
+                'created_at': now,
+                'updated_at': now
+            })
+            logger.debug("Created guide stub: %s", guide_id)
+        except Exception as e:
+            logger.error("Failed to create guide stub: %s", e, exc_info=True)
+            raise DatabaseError(f"Failed to create guide stub: {str(e)}")
+            
     async def add_subtopic_node(self, guide_id: str, ai: str, parent_node_id: str, new_node: Dict[str, Any]) -> bool:
         """Add a subtopic node to a specific AI's research tree"""
         try:
             await self.initialize()
-            logger.debug(f"[DEBUG MongoDBService] Adding subtopic node to guide {guide_id}, AI {ai}, parent {parent_node_id}")
-            logger.debug(f"[DEBUG MongoDBService] New node data: {json.dumps(new_node, default=str)}")
-            
-            # Update the guide document to add the new node as a child of the specified parent
-            logger.debug(f"[DEBUG MongoDBService] Attempting direct update at root level")
-            
-            # Log the current structure
-            current_guide = await self.get_guide(guide_id)
-            if current_guide:
-                has_trees = "trees" in current_guide
-                has_ai = has_trees and ai in current_guide.get("trees", {})
-                logger.debug(f"[DEBUG MongoDBService] Current guide has trees: {has_trees}, has AI '{ai}': {has_ai}")
-                
-                if has_ai:
-                    root_node_id = current_guide["trees"][ai].get("node_id")
-                    logger.debug(f"[DEBUG MongoDBService] AI '{ai}' root node ID: {root_node_id}")
-                    logger.debug(f"[DEBUG MongoDBService] Looking for parent node ID: {parent_node_id}")
-                    
-                    # Check if the root node is the parent
-                    if root_node_id == parent_node_id:
-                        logger.debug(f"[DEBUG MongoDBService] Parent node is the root node")
+            logger.debug("[DEBUG MongoDBService] Adding subtopic node to guide %s, AI %s, parent %s", guide_id, ai, parent_node_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[DEBUG MongoDBService] New node data: %s", _dump_json(new_node))
+            
+            # Update the guide document to add the new node as a child of the specified parent.
+            # The filter doubles as the existence check, so no read precedes the write.
+            logger.debug("[DEBUG MongoDBService] Attempting direct update at root level")
             
             # First attempt: Try updating at root level
             result = await self.guide_collection.update_one(
@@ -331,9 +384,9 @@ class MongoDBService(DatabaseService):
                 {"$push": {f"trees.{ai}.children": new_node}}
             )
             
-            logger.debug(f"[DEBUG MongoDBService] Direct update result - matched: {result.matched_count}, modified: {result.modified_count}")
+            logger.debug("[DEBUG MongoDBService] Direct update result - matched: %s, modified: %s", result.matched_count, result.modified_count)
             
-            if result.modified_count == 0:
+            if result.matched_count == 0:
                 # Try to find the parent node deeper in the tree
                 # This requires a more complex update using the aggregation pipeline
                 logger.debug("[DEBUG MongoDBService] Parent node not found at root level, searching deeper in tree")
@@ -341,10 +394,10 @@ class MongoDBService(DatabaseService):
                 # Get the current guide document
                 guide = await self.get_guide(guide_id)
                 if not guide or "trees" not in guide or ai not in guide["trees"]:
-                    logger.error(f"[DEBUG MongoDBService] Could not find guide, trees, or AI '{ai}' in guide")
+                    logger.error("[DEBUG MongoDBService] Could not find guide, trees, or AI '%s' in guide", ai)
                     return False
                 
-                logger.debug(f"[DEBUG MongoDBService] Retrieved guide document, has trees for AI '{ai}': {ai in guide.get('trees', {})}")
+                logger.debug("[DEBUG MongoDBService] Retrieved guide document, has trees for AI '%s': %s", ai, ai in guide.get('trees', {}))
                 
                 # Manually traverse the tree to find the parent node
                 found = False
@@ -353,18 +406,18 @@ class MongoDBService(DatabaseService):
                     if found:
                         return
                         
-                    logger.debug(f"[DEBUG MongoDBService] Checking node: {node.get('node_id')} at path {path}")
+                    logger.debug("[DEBUG MongoDBService] Checking node: %s at path %s", node.get('node_id'), path)
                         
                     if node.get("node_id") == parent_node_id:
                         # Found the parent node, update it
-                        logger.debug(f"[DEBUG MongoDBService] Found parent node at path {path}")
+                        logger.debug("[DEBUG MongoDBService] Found parent node at path %s", path)
                         
                         if "children" not in node:
-                            logger.debug(f"[DEBUG MongoDBService] Parent node has no children array, creating one")
+                            logger.debug("[DEBUG MongoDBService] Parent node has no children array, creating one")
                             node["children"] = []
                             
                         node["children"].append(new_node)
-                        logger.debug(f"[DEBUG MongoDBService] Added new node to parent's children, new count: {len(node['children'])}")
+                        logger.debug("[DEBUG MongoDBService] Added new node to parent's children, new count: %s", len(node['children']))
                         
                         # Update the entire tree in the database
                         update_result = await self.guide_collection.update_one(
@@ -372,47 +425,53 @@ class MongoDBService(DatabaseService):
                             {"$set": {f"trees.{ai}": guide["trees"][ai]}}
                         )
                         found = update_result.modified_count > 0
-                        logger.debug(f"[DEBUG MongoDBService] Updated entire tree - matched: {update_result.matched_count}, modified: {update_result.modified_count}")
+                        logger.debug("[DEBUG MongoDBService] Updated entire tree - matched: %s, modified: %s", update_result.matched_count, update_result.modified_count)
                         return
                     
                     # Recursively search children
                     if "children" in node:
-                        logger.debug(f"[DEBUG MongoDBService] Node has {len(node['children'])} children, searching recursively")
+                        logger.debug("[DEBUG MongoDBService] Node has %s children, searching recursively", len(node['children']))
                         for i, child in enumerate(node["children"]):
                             await traverse_and_update(child, path + f".children.{i}")
                     else:
-                        logger.debug(f"[DEBUG MongoDBService] Node has no children, skipping")
+                        logger.debug("[DEBUG MongoDBService] Node has no children, skipping")
                 
                 # Start traversal from the root node of this AI's tree
-                logger.debug(f"[DEBUG MongoDBService] Starting recursive traversal from root node")
+                logger.debug("[DEBUG MongoDBService] Starting recursive traversal from root node")
                 await traverse_and_update(guide["trees"][ai], f"trees.{ai}")
                 
                 if found:
-                    logger.debug(f"[DEBUG MongoDBService] Successfully added node via recursive traversal")
+                    logger.debug("[DEBUG MongoDBService] Successfully added node via recursive traversal")
                 else:
-                    logger.error(f"[DEBUG MongoDBService] Could not find parent node {parent_node_id} in the tree for AI {ai}")
+                    logger.error("[DEBUG MongoDBService] Could not find parent node %s in the tree for AI %s", parent_node_id, ai)
                 
                 return found
             
-            logger.debug(f"[DEBUG MongoDBService] Successfully added node at root level")
+            logger.debug("[DEBUG MongoDBService] Successfully added node at root level")
             return result.modified_count > 0
             
         except Exception as e:
-            logger.error(f"[DEBUG MongoDBService] Failed to add subtopic node: {str(e)}", exc_info=True)
+            logger.error("[DEBUG MongoDBService] Failed to add subtopic node: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to add subtopic node: {str(e)}")
             
     async def get_cached_research(self, topic: str) -> Optional[Dict[str, Any]]:
         """Retrieve cached research results"""
         try:
             await self.initialize()
-            logger.debug(f"Looking up cached research for topic: {topic}")
-            doc = await self.guide_collection.find_one({
-                'topic': {'$regex': topic, '$options': 'i'}
-            })
-            logger.debug(f"Cached research lookup result: {doc}")
+            logger.debug("Looking up cached research for topic: %s", topic)
+            # $text uses the topic text index instead of scanning every guide with an
+            # unanchored regex. Quoting the topic makes it a case-insensitive phrase match,
+            # so guides must contain the whole topic rather than any one of its words
+            phrase = '"' + topic.replace('"', ' ') + '"'
+            doc = await self.guide_collection.find_one(
+                {'$text': {'$search': phrase}},
+                projection={'score': {'$meta': 'textScore'}},
+                sort=[('score', {'$meta': 'textScore'})]
+            )
+            logger.debug("Cached research lookup result: %s", doc)
             return doc
         except Exception as e:
-            logger.error(f"Failed to retrieve cached research: {str(e)}", exc_info=True)
+            logger.error("Failed to retrieve cached research: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to retrieve cached research: {str(e)}")
             
     async def update_guide_status(self, guide_id: str, status: str, message: Optional[str] = None):
@@ -433,15 +492,38 @@ class MongoDBService(DatabaseService):
         except Exception as e:
             raise DatabaseError(f"Failed to update guide status: {str(e)}")
             
+    async def claim_guide_for_research(self, guide_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically mark a guide as running unless it already is.
+
+        Returns the guide's topic on success, or None if the guide is missing or
+        its research is already running (see guide_exists to tell them apart).
+        """
+        try:
+            await self.initialize()
+            return await self.guide_collection.find_one_and_update(
+                {'_id': ObjectId(guide_id), 'status': {'$ne': 'running'}},
+                {'$set': {'status': 'running', 'updated_at': datetime.now(timezone.utc)}},
+                projection={'_id': 0, 'topic': 1},
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            raise DatabaseError(f"Failed to claim guide for research: {str(e)}")
+            
+    async def guide_exists(self, guide_id: str) -> bool:
+        """Check whether a guide exists without fetching it"""
+        try:
+            await self.initialize()
+            return await self.guide_collection.count_documents({'_id': ObjectId(guide_id)}, limit=1) > 0
+        except Exception as e:
+            raise DatabaseError(f"Failed to check guide: {str(e)}")
+            
     async def close(self):
-        """Close the database connection"""
-        if self.client:
-            self.client.close()
-            self.client = None
+        """Release the database handles (the shared client stays open for other services)"""
+        if self.db is not None:
             self.db = None
             self.research_collection = None
             self.guide_collection = None
-            logger.debug("MongoDB connection closed")
+            logger.debug("MongoDB connection released")
 
 class LoggingService(LoggingService):
     """Logging service implementation"""
@@ -456,17 +538,20 @@ class LoggingService(LoggingService):
     async def log_interaction(self, service: str, step: str, query: str, response: str, tokens: int):
         """Log service interaction"""
         try:
+            if not self.logger.isEnabledFor(logging.INFO):
+                return
             log_entry = {
-                'timestamp': datetime.utcnow(),
+                'timestamp': datetime.now(timezone.utc),
                 'service': service,
                 'step': step,
                 'query': query,
                 'response': response,
                 'tokens': tokens
             }
-            self.logger.info(json.dumps(log_entry))
+            # orjson serialises the datetime natively (json.dumps raised TypeError on it)
+            self.logger.info(orjson.dumps(log_entry, default=str).decode())
         except Exception as e:
-            self.logger.error(f"Failed to log interaction: {str(e)}")
+            self.logger.error("Failed to log interaction: %s", e)
 
 class GrokDeepSearchService(SearchService):
     """Implementation of Grok DeepSearch service"""
@@ -474,7 +559,7 @@ class GrokDeepSearchService(SearchService):
         self.config = config
         self.session = None
         logger.debug("Initializing GrokDeepSearchService")
-        logger.debug(f"Using API key: {self.config.xai_api_key[:5]}...")
+        logger.debug("Using API key: %s...", self.config.xai_api_key[:5])
     
     async def __aenter__(self):
         logger.debug("Creating aiohttp session for GrokDeepSearchService")
@@ -488,7 +573,7 @@ class GrokDeepSearchService(SearchService):
     
     async def search(self, query: str) -> Dict[str, Any]:
         """Execute Grok DeepSearch API request"""
-        logger.debug(f"GrokDeepSearchService.search called with query: {query}")
+        logger.debug("GrokDeepSearchService.search called with query: %s", query)
         
         if not self.session:
             logger.error("Session not initialized for GrokDeepSearchService")
@@ -511,62 +596,59 @@ class GrokDeepSearchService(SearchService):
             "temperature": 0.5
         }
         
-        logger.debug(f"Making Grok API request to {url}")
-        logger.debug(f"Request headers: {json.dumps({k: v[:5] + '...' if k == 'Authorization' else v for k, v in headers.items()}, indent=2)}")
-        logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
+        logger.debug("Making Grok API request to %s", url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request headers: %s", _dump_json({k: v[:5] + '...' if k == 'Authorization' else v for k, v in headers.items()}, indent=True))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request payload: %s", _dump_json(payload, indent=True))
         
         try:
             logger.debug("Sending POST request to Grok API")
             async with self.session.post(url, json=payload, headers=headers) as response:
-                logger.debug(f"Grok API response status: {response.status}")
+                logger.debug("Grok API response status: %s", response.status)
                 if response.status != 200:
                     error_text = await response.text()
-                    logger.error(f"Grok API error response: {error_text}")
+                    logger.error("Grok API error response: %s", error_text)
                     raise SearchError(f"Grok API error: {response.status} - {error_text}")
                     
                 data = await response.json()
-                logger.debug(f"Grok API response data: {json.dumps(data, indent=2)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Grok API response data: %s", _dump_json(data, indent=True))
                 
                 if "choices" not in data:
                     logger.error("No choices in Grok API response")
                     raise SearchError("No response from Grok API")
                     
                 content = data["choices"][0]["message"]["content"]
-                logger.debug(f"Grok API content: {content}")
+                logger.debug("Grok API content: %s", content)
                 
                 try:
                     # Extract JSON if wrapped in markdown
-                    if "```json" in content:
-                        logger.debug("Extracting JSON from markdown code block")
-                        content = content.split("```json")[1].split("```")[0]
-                    elif "```" in content:
+                    fenced = _CODE_FENCE_RE.search(content)
+                    if fenced:
                         logger.debug("Extracting JSON from code block")
-                        content = content.split("```")[1].split("```")[0]
+                        content = fenced.group(1)
                     
                     logger.debug("Parsing Grok API response as JSON")
-                    structured_data = json.loads(content)
+                    structured_data = orjson.loads(content)
                     
                     # Validate required fields
-                    required_fields = [
-                        "summary", "key_points", "entities", "subtopics",
-                        "timeline", "further_research", "references"
-                    ]
-                    
-                    for field in required_fields:
+                    for field in _GROK_REQUIRED_FIELDS:
                         if field not in structured_data:
-                            logger.warning(f"Missing field in Grok response: {field}")
+                            logger.warning("Missing field in Grok response: %s", field)
                             structured_data[field] = [] if field != "summary" else ""
                     
                     logger.debug("Successfully parsed and validated Grok API response")
-                    logger.debug(f"Structured data: {json.dumps(structured_data, indent=2)}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Structured data: %s", _dump_json(structured_data, indent=True))
                     return structured_data
                     
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse Grok response as JSON: {str(e)}")
-                    logger.error(f"Raw content: {content}")
+                except orjson.JSONDecodeError as e:
+                    logger.error("Failed to parse Grok response as JSON: %s", e)
+                    logger.error("Raw content: %s", content)
                     raise SearchError("Failed to parse Grok response as JSON")
         except Exception as e:
-            logger.error(f"Grok DeepSearch failed: {str(e)}", exc_info=True)
+            logger.error("Grok DeepSearch failed: %s", e, exc_info=True)
             raise SearchError(f"Grok DeepSearch failed: {str(e)}")
             
     def _format_query(self, query: str) -> str:
@@ -19,8 +19,9 @@ def load_env():
     # Import config variables
     try:
         import config
-        if not os.environ.get('MONGO_URI') and hasattr(config, 'MONGO_URI'):
-            os.environ['MONGO_URI'] = config.MONGO_URI
+        mongo_uri = getattr(config, 'MONGO_URI', None)
+        if not os.environ.get('MONGO_URI') and mongo_uri:
+            os.environ['MONGO_URI'] = mongo_uri
     except ImportError:
         pass
     
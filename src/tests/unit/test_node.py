@@ -0,0 +1,83 @@
+"""
+Tests for the research tree Node model
+"""
+from datetime import datetime
+
+from src.backend.models.node import Node
+
+NOW = datetime(2024, 1, 1)
+
+def make_tree():
+    """A small nested tree: two children, the first with two children of its own"""
+    return {
+        "node_id": "root",
+        "topic": "How to start a podcast",
+        "status": "completed",
+        "research": {"summary": "root summary"},
+        "created_at": NOW,
+        "updated_at": NOW,
+        "children": [
+            {
+                "node_id": "a",
+                "topic": "Podcast equipment",
+                "status": "completed",
+                "research": {},
+                "created_at": NOW,
+                "updated_at": NOW,
+                "children": [
+                    {"node_id": "a1", "topic": "Microphones", "status": "completed", "research": {},
+                     "created_at": NOW, "updated_at": NOW, "children": []},
+                    {"node_id": "a2", "topic": "Headphones", "status": "completed", "research": {},
+                     "created_at": NOW, "updated_at": NOW, "children": []}
+                ]
+            },
+            {
+                "node_id": "b",
+                "topic": "Podcast hosting",
+                "status": "initializing",
+                "research": {},
+                "created_at": NOW,
+                "updated_at": NOW,
+                "children": []
+            }
+        ]
+    }
+
+class TestNodeDecoding:
+    """Tests for Node.from_dict / from_dicts"""
+
+    def test_nested_tree_round_trips(self):
+        """Decoding then encoding a nested tree should reproduce it exactly"""
+        tree = make_tree()
+        assert Node.from_dict(tree).to_dict() == tree
+
+    def test_sibling_order_is_kept(self):
+        """Children should come back in their stored order at every level"""
+        root = Node.from_dict(make_tree())
+        assert [child.node_id for child in root.children] == ["a", "b"]
+        assert [child.node_id for child in root.children[0].children] == ["a1", "a2"]
+
+    def test_from_dicts_keeps_top_level_order(self):
+        """Decoding several trees should return their roots in input order"""
+        trees = [make_tree(), {"node_id": "other", "topic": "Another topic"}]
+        assert [node.node_id for node in Node.from_dicts(trees, NOW)] == ["root", "other"]
+
+    def test_empty_child_decodes_to_none(self):
+        """An empty or None child entry should decode to None in its place"""
+        tree = make_tree()
+        tree["children"].insert(1, None)
+        root = Node.from_dict(tree)
+        assert [child.node_id if child else None for child in root.children] == ["a", None, "b"]
+
+    def test_missing_timestamps_share_now(self):
+        """Nodes without timestamps should all get the `now` passed in"""
+        root = Node.from_dict({"topic": "Root", "children": [{"topic": "Child"}]}, NOW)
+        child = root.children[0]
+        assert (root.created_at, root.updated_at, child.created_at, child.updated_at) == (NOW,) * 4
+        assert root.status == "initializing"
+
+    def test_find_node_by_id(self):
+        """Lookups should reach nodes at any depth"""
+        root = Node.from_dict(make_tree())
+        assert root.find_node_by_id("a2").topic == "Headphones"
+        assert root.find_node_by_id("missing") is None
@@ -0,0 +1,87 @@
+"""
+Tests for the in-process research result cache
+"""
+import asyncio
+
+from src.langchain.chains.research_cache import ResearchCache
+
+class TestResearchCache:
+    """Tests for ResearchCache lookups, expiry and eviction"""
+    
+    def test_normalized_topics_share_an_entry(self):
+        """Topics differing only in case and whitespace should hit the same entry"""
+        cache = ResearchCache()
+        cache.set("How to start a podcast", {"trees": {}})
+        assert cache.get("  how TO start   a podcast ") == {"trees": {}}
+        assert cache.get("How to start a blog") is None
+    
+    def test_expired_entries_are_dropped(self):
+        """Entries older than the TTL should not be returned"""
+        cache = ResearchCache(ttl=-1)
+        cache.set("How to start a podcast", {"trees": {}})
+        assert cache.get("How to start a podcast") is None
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        """A full cache should evict the entry used least recently"""
+        cache = ResearchCache(maxsize=2)
+        cache.set("topic one here", {"n": 1})
+        cache.set("topic two here", {"n": 2})
+        cache.get("topic one here")
+        cache.set("topic three here", {"n": 3})
+        assert cache.get("topic one here") == {"n": 1}
+        assert cache.get("topic two here") is None
+        assert cache.get("topic three here") == {"n": 3}
+    
+    def test_concurrent_misses_compute_once(self):
+        """Concurrent requests for one topic should share a single computation"""
+        cache = ResearchCache()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return {"trees": {"grok": {}}}
+            
+        async def run():
+            return await asyncio.gather(*(
+                cache.get_or_compute("How to start a podcast", compute) for _ in range(3)
+            ))
+            
+        results = asyncio.run(run())
+        assert results == [{"trees": {"grok": {}}}] * 3
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses, cache.coalesced) == (0, 1, 2)
+        assert cache.get("how to start a podcast") == {"trees": {"grok": {}}}
+    
+    def test_cancelled_owner_does_not_cancel_joiners(self):
+        """Cancelling the request that started a computation should not fail those sharing it"""
+        cache = ResearchCache()
+        release = None
+        
+        async def compute():
+            await release.wait()
+            return {"trees": {}}
+            
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            owner = asyncio.ensure_future(cache.get_or_compute("How to start a podcast", compute))
+            await asyncio.sleep(0)
+            joiner = asyncio.ensure_future(cache.get_or_compute("How to start a podcast", compute))
+            await asyncio.sleep(0)
+            owner.cancel()
+            release.set()
+            return await joiner, owner.cancelled()
+            
+        assert asyncio.run(run()) == ({"trees": {}}, True)
+        assert cache.get("How to start a podcast") == {"trees": {}}
+        assert cache.stats()["inflight"] == 0
+    
+    def test_clear_forgets_inflight_computations(self):
+        """clear() should drop both cached entries and in-flight computations"""
+        cache = ResearchCache()
+        cache.set("How to start a podcast", {"trees": {}})
+        cache._inflight["pending"] = None
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["inflight"] == 0
@@ -0,0 +1,145 @@
+"""
+Tests for the guide claim and background research paths, against an in-memory guides collection
+"""
+import asyncio
+
+from bson import ObjectId
+
+import src.langchain.chains.ai_council as ai_council
+from src.backend.blueprints import research as research_blueprint
+from src.langchain.chains.research_services import MongoDBService
+
+class FakeGuides:
+    """Just enough of the async guides collection for the claim and initialize paths"""
+
+    def __init__(self, *guides):
+        self.guides = {guide["_id"]: guide for guide in guides}
+
+    async def find_one_and_update(self, filter, update, projection=None, return_document=None):
+        guide = self.guides.get(filter["_id"])
+        if guide is None or guide.get("status") == filter["status"]["$ne"]:
+            return None
+        guide.update(update["$set"])
+        return {"topic": guide["topic"]}
+
+    async def count_documents(self, filter, limit=0):
+        return int(filter["_id"] in self.guides)
+
+    async def update_one(self, filter, update, upsert=False):
+        self.guides.setdefault(filter["_id"], {"_id": filter["_id"]}).update(update["$set"])
+
+    async def insert_one(self, doc):
+        self.guides[doc["_id"]] = doc
+
+    def with_options(self, **kwargs):
+        return self
+
+def make_service(guides):
+    """A MongoDBService whose guide collection is the fake"""
+    service = MongoDBService(config=None)
+    service.db = object()  # Skips initialize()
+    service.guide_collection = guides
+    return service
+
+class TestClaimGuideForResearch:
+    """Tests for MongoDBService.claim_guide_for_research"""
+
+    def test_second_claim_is_rejected(self):
+        """Only the first claim should succeed; the guide still exists afterwards"""
+        guide_id = ObjectId()
+        service = make_service(FakeGuides({"_id": guide_id, "topic": "How to start a podcast", "status": "completed"}))
+
+        async def run():
+            first = await service.claim_guide_for_research(str(guide_id))
+            second = await service.claim_guide_for_research(str(guide_id))
+            return first, second, await service.guide_exists(str(guide_id))
+
+        assert asyncio.run(run()) == ({"topic": "How to start a podcast"}, None, True)
+
+    def test_missing_guide_is_not_claimed(self):
+        """A missing guide should neither be claimed nor reported as existing"""
+        service = make_service(FakeGuides())
+        missing_id = str(ObjectId())
+
+        async def run():
+            return await service.claim_guide_for_research(missing_id), await service.guide_exists(missing_id)
+
+        assert asyncio.run(run()) == (None, False)
+
+class SlowCouncil:
+    """Council whose research never finishes within a test, so the guide stays claimed"""
+
+    async def conduct_research(self, topic, **kwargs):
+        await asyncio.sleep(3600)
+
+def test_initialize_twice_returns_409(monkeypatch):
+    """A second initialize call should get 409 while research runs, and 404 for a missing guide"""
+    from app import create_app
+
+    guide_id = ObjectId()
+    guides = FakeGuides({"_id": guide_id, "topic": "How to start a podcast", "status": "completed"})
+
+    async def fake_initialize(self):
+        self.db = object()
+        self.guide_collection = guides
+
+    monkeypatch.setattr(MongoDBService, "initialize", fake_initialize)
+    monkeypatch.setattr(ai_council, "get_council", lambda: SlowCouncil())
+    app = create_app()
+
+    async def run():
+        client = app.test_client()
+        first = await client.post(f"/api/research/initialize/{guide_id}")
+        second = await client.post(f"/api/research/initialize/{guide_id}")
+        missing = await client.post(f"/api/research/initialize/{ObjectId()}")
+        return first.status_code, second.status_code, missing.status_code
+
+    assert asyncio.run(run()) == (202, 409, 404)
+
+class GatedCouncil:
+    """Council that waits for the test to subscribe, then reports one member's tree"""
+
+    release = None
+
+    async def conduct_research(self, topic, session_id=None, on_partial=None, **kwargs):
+        await self.release.wait()
+        tree = {"node_id": session_id, "topic": topic, "status": "completed", "research": {}, "children": []}
+        await on_partial("grok", tree)
+        return {"topic": topic, "trees": {"grok": tree}}
+
+def test_background_research_publishes_to_stream_subscribers(monkeypatch):
+    """Research started from /api/research should publish its partial and completed events"""
+    from app import create_app
+
+    guides = FakeGuides()
+
+    async def fake_initialize(self):
+        self.db = object()
+        self.guide_collection = guides
+
+    council = GatedCouncil()
+    monkeypatch.setattr(MongoDBService, "initialize", fake_initialize)
+    monkeypatch.setattr(ai_council, "get_council", lambda: council)
+    app = create_app()
+
+    async def run():
+        council.release = asyncio.Event()
+        response = await app.test_client().post("/api/research", json={"topic": "How to start a podcast"})
+        guide_id = (await response.get_json())["guide_id"]
+        queue = asyncio.Queue()
+        research_blueprint._RESEARCH_STREAMS[guide_id].add(queue)
+        try:
+            council.release.set()
+            events = []
+            while not events or events[-1]["status"] not in ("completed", "failed"):
+                events.append(await asyncio.wait_for(queue.get(), 5))
+            return guide_id, events
+        finally:
+            research_blueprint._RESEARCH_STREAMS.pop(guide_id, None)
+
+    guide_id, events = asyncio.run(run())
+    # The initial "running" event may go out before the test subscribes
+    assert [(event["status"], event.get("ai")) for event in events][-2:] == [
+        ("running", "grok"), ("completed", None)
+    ]
+    assert guides.guides[ObjectId(guide_id)]["status"] == "completed"
@@ -0,0 +1,44 @@
+"""
+Tests for parsing Google search output into web result entries
+"""
+import pytest
+
+from src.langchain.chains.ai_council import parse_web_results
+
+def split_parse(web_results):
+    """The original line-splitting parser, kept as the reference behaviour"""
+    return [
+        {"title": r.split(" - ")[0].strip(), "url": r.split(" - ")[1].strip()}
+        for r in web_results.split("\n")
+        if " - " in r
+    ]
+
+SAMPLES = [
+    "",
+    "no separator on this line",
+    "Podcasting 101 - https://example.com/podcasting",
+    "Podcasting 101 - https://example.com/podcasting\nStarting out - https://example.org/start",
+    "Title - https://a.example - trailing description",
+    "  Padded title   -   https://padded.example  ",
+    "first line without separator\nKept - https://kept.example\n\nalso skipped",
+    "Windows line - https://crlf.example\r\nNext - https://next.example\r\n",
+    " - https://no-title.example",
+    "No url - ",
+    "Title - https://x.example\n",
+]
+
+class TestParseWebResults:
+    """parse_web_results should match the split-based parser it replaced"""
+
+    @pytest.mark.parametrize("web_results", SAMPLES)
+    def test_matches_split_parser(self, web_results):
+        assert parse_web_results(web_results) == split_parse(web_results)
+
+    def test_title_and_url(self):
+        """Each separated line should yield its title and URL"""
+        assert parse_web_results(
+            "Podcasting 101 - https://example.com/podcasting\nStarting out - https://example.org/start"
+        ) == [
+            {"title": "Podcasting 101", "url": "https://example.com/podcasting"},
+            {"title": "Starting out", "url": "https://example.org/start"}
+        ]
@@ -49,7 +49,7 @@ logger.info(f"Working directory: {os.getcwd()}")
 logger.info(f"Debug mode: {DEBUG_MODE}")
 
 # Import application after logging is configured
-from src.app import create_app
+from src.app import create_app, install_event_loop_policy
 
 # Create the application
 logger.info("Creating application...")
@@ -63,5 +63,8 @@ logger.info(f"URL Map: {app.url_map}")
 logger.info("========== APPLICATION READY ==========")
 
 if __name__ == "__main__":
-    logger.info("Running application in debug mode...")
-    app.run(debug=True) 
\ No newline at end of file
+    # Under Hypercorn the loop is chosen with `-k uvloop` instead (see run_prod.py)
+    logger.info(f"Event loop: {install_event_loop_policy()}")
+    # Development server only; production deployments use run_prod.py
+    logger.info(f"Running development server (debug/reloader: {DEBUG_MODE})...")
+    app.run(debug=DEBUG_MODE, use_reloader=DEBUG_MODE) 
\ No newline at end of file